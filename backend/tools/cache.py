@@ -0,0 +1,55 @@
+"""In-process result cache shared by the search tools."""
+
+import copy
+import functools
+import inspect
+import threading
+import time
+
+
+def cache_successful_results(ttl: float, max_entries: int = 512):
+    """Cache a tool's successful results for ttl seconds.
+    
+    Results are keyed on the tool's bound arguments (defaults applied), so
+    the same search spelled with and without default arguments shares one
+    entry. Only results with "success": True are stored; errors are always
+    retried. Callers receive a copy so mutating a result cannot corrupt
+    the cache. Once max_entries is reached, expired entries are dropped and
+    then the oldest entry is evicted.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = tuple(bound.arguments.values())
+                hash(key)
+            except TypeError:  # unhashable arguments (e.g. lists) skip the cache
+                return func(*args, **kwargs)
+            
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+            if entry is not None and entry[1] > now:
+                return copy.deepcopy(entry[0])
+            
+            result = func(*args, **kwargs)
+            if isinstance(result, dict) and result.get("success"):
+                with lock:
+                    if key not in entries and len(entries) >= max_entries:
+                        for expired in [k for k, e in entries.items() if e[1] <= now]:
+                            del entries[expired]
+                        if len(entries) >= max_entries:
+                            del entries[next(iter(entries))]
+                    entries[key] = (copy.deepcopy(result), time.monotonic() + ttl)
+            return result
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    
+    return decorator
@@ -1,8 +1,10 @@
 """Shared configuration for tools."""
 
+import copy
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -11,21 +13,38 @@ logger = logging.getLogger(__name__)
 CONFIG_FILE = Path(__file__).parent.parent / "model_config.json"
 
 
+# Parsed config keyed by the file's (mtime, size), so repeated tool setup
+# only stats the file; the Settings UI rewriting it invalidates the entry
+_config_cache: tuple[tuple[int, int], dict] | None = None
+_config_cache_lock = threading.Lock()
+
+
 def load_config_file() -> dict | None:
     """Load model configuration from JSON file.
     
+    The parsed file is cached until its modification time or size changes;
+    each caller gets its own copy.
+    
     Returns:
         Configuration dict if file exists and is valid, None otherwise.
     """
-    if not CONFIG_FILE.exists():
-        return None
+    global _config_cache
     
     try:
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning(f"[TOOLS CONFIG] Error reading config: {e}")
+        stat = CONFIG_FILE.stat()
+    except OSError:
         return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    with _config_cache_lock:
+        if _config_cache is None or _config_cache[0] != signature:
+            try:
+                with open(CONFIG_FILE, "r") as f:
+                    _config_cache = (signature, json.load(f))
+            except Exception as e:
+                logger.warning(f"[TOOLS CONFIG] Error reading config: {e}")
+                return None
+        return copy.deepcopy(_config_cache[1])
 
 
 def get_enabled_tools() -> dict:
@@ -52,6 +71,7 @@ def get_enabled_tools() -> dict:
         "tavily_crawl": True,
         # Perplexity tools
         "perplexity_search": True,
+        "perplexity_batch_search": True,
         "perplexity_chat": True,
         # Semrush tools
         "semrush_domain_overview": True,
@@ -62,18 +82,18 @@ def get_enabled_tools() -> dict:
         "semrush_traffic_analytics": True,
         # Serper tools
         "serper_google_search": True,
+        "serper_batch_search": True,
     }
     
     try:
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE) as f:
-                config = json.load(f)
-                enabled_tools = config.get("enabled_tools", {})
-                # Merge with defaults (missing keys default to True)
-                for key in default_config:
-                    if key not in enabled_tools:
-                        enabled_tools[key] = default_config[key]
-                return enabled_tools
+        config = load_config_file()
+        if config is not None:
+            enabled_tools = config.get("enabled_tools", {})
+            # Merge with defaults (missing keys default to True)
+            for key in default_config:
+                if key not in enabled_tools:
+                    enabled_tools[key] = default_config[key]
+            return enabled_tools
     except Exception as e:
         logger.warning(f"[TOOLS] Error reading enabled_tools config: {e}")
     
@@ -2,11 +2,15 @@
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from .config import load_config_file, get_enabled_tools
 
 logger = logging.getLogger(__name__)
 
+# Concurrent searches issued by perplexity_batch_search, kept within the API rate limits
+BATCH_MAX_WORKERS = 10
+
 
 def get_perplexity_tools() -> list:
     """Get Perplexity API tools if API key is configured.
@@ -20,6 +24,7 @@ def get_perplexity_tools() -> list:
         
     Available tools:
         - perplexity_search: Raw search results via /search endpoint
+        - perplexity_batch_search: Several /search queries run concurrently
         - perplexity_chat: AI answers via /chat/completions endpoint
     """
     config = load_config_file()
@@ -34,12 +39,30 @@ def get_perplexity_tools() -> list:
     
     try:
         import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
         
         BASE_URL = "https://api.perplexity.ai"
-        headers = {
+        
+        # Retry transient 429/5xx responses at the transport layer with
+        # exponential backoff, honouring Retry-After when the API sends it.
+        # Read timeouts and other failures after the request was sent are not
+        # retried: a billed /chat/completions may already be running
+        retries = Retry(
+            total=4,
+            read=0,
+            other=0,
+            backoff_factor=0.4,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(max_retries=retries))
+        session.headers.update({
             "Authorization": f"Bearer {perplexity_api_key}",
             "Content-Type": "application/json"
-        }
+        })
         
         def perplexity_search(
             query: str,
@@ -58,9 +81,8 @@ def get_perplexity_tools() -> list:
                 Dictionary containing search results with URLs and metadata
             """
             try:
-                response = requests.post(
+                response = session.post(
                     f"{BASE_URL}/search",
-                    headers=headers,
                     json={
                         "query": query,
                         "num_results": num_results
@@ -72,6 +94,34 @@ def get_perplexity_tools() -> list:
             except requests.exceptions.RequestException as e:
                 return {"error": str(e)}
         
+        def perplexity_batch_search(
+            queries: list[str],
+            num_results: int = 10
+        ) -> list[dict]:
+            """Run several independent Perplexity searches concurrently.
+            
+            Use this instead of repeated perplexity_search calls when you need
+            to look up multiple unrelated facts or sub-topics at once.
+            
+            Args:
+                queries: List of search query strings
+                num_results: Number of results to return per query (default 10)
+            
+            Returns:
+                List of search results, one per query and in the same order
+            """
+            if not queries:
+                return []
+            
+            def _search(query: str) -> dict:
+                try:
+                    return perplexity_search(query, num_results)
+                except Exception as e:
+                    return {"error": str(e)}
+            
+            with ThreadPoolExecutor(max_workers=min(len(queries), BATCH_MAX_WORKERS)) as executor:
+                return list(executor.map(_search, queries))
+        
         def perplexity_chat(
             query: str,
             model: str = "sonar",
@@ -118,9 +168,8 @@ def get_perplexity_tools() -> list:
                 if domains and len(domains) > 0:
                     payload["search_domain_filter"] = domains[:20]
                 
-                response = requests.post(
+                response = session.post(
                     f"{BASE_URL}/chat/completions",
-                    headers=headers,
                     json=payload,
                     timeout=120
                 )
@@ -157,6 +206,9 @@ def get_perplexity_tools() -> list:
         if enabled.get("perplexity_search", True):
             tools.append(perplexity_search)
             tool_names.append("perplexity_search")
+        if enabled.get("perplexity_batch_search", True):
+            tools.append(perplexity_batch_search)
+            tool_names.append("perplexity_batch_search")
         if enabled.get("perplexity_chat", True):
             tools.append(perplexity_chat)
             tool_names.append("perplexity_chat")
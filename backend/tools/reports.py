@@ -1,11 +1,23 @@
 """Report generation tools for converting Markdown to various formats."""
 
+import bisect
+import functools
+import gzip
+import html as html_module
+import importlib.util
+import itertools
+import json
 import logging
 import math
 import os
 import re
+import string
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from langchain.tools import ToolRuntime
 from langchain_core.messages import ToolMessage
@@ -15,6 +27,101 @@ from .config import get_enabled_tools
 
 logger = logging.getLogger(__name__)
 
+# Patterns used while parsing tables and rewriting generated HTML
+TABLE_BLOCK_RE = re.compile(r'(?:^\|[^\n]*(?:\n|$))+', re.MULTILINE)
+# A cell whose digits, '.' and '-' (everything _extract_number keeps) form a
+# valid float: an optional '-', then digits with at most one '.', e.g. "$1,200",
+# "-5.2%", "12.5K"; "2024-01" and "1.2.3" are rejected, as float() would
+NUMERIC_CELL_RE = re.compile(
+    r'[^\d.\-]*(?:-[^\d.\-]*)?(?:\d[^.\-]*(?:\.[^.\-]*)?|\.[^\d.\-]*\d[^.\-]*)'
+)
+HTML_TOKEN_RE = re.compile(r'<(h[12])([^>]*)>([^<]+)</\1>|<table>', re.IGNORECASE)
+ATTR_ID_RE = re.compile(r'\s+id\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>"\']+)', re.IGNORECASE)
+FIRST_H1_RE = re.compile(r'<h1[^>]*>.*?</h1>\s*', re.IGNORECASE | re.DOTALL)
+NUMBERED_ITEM_RE = re.compile(r'\d+\.\s')
+# Inline Markdown markup stripped by _clean_markdown; the named group is the text kept
+MARKDOWN_INLINE_RE = re.compile(
+    r'\*\*\*(?P<strong>[^*]+)\*\*\*|\*\*(?P<bold>[^*]+)\*\*|\*(?P<em>[^*]+)\*'
+    r'|__(?P<bold2>[^_]+)__|_(?P<em2>[^_]+)_'
+    r'|`(?P<code>[^`]+)`|\[(?P<link>[^\]]+)\]\([^)]+\)'
+)
+# CSS string literals are matched first so their contents are never touched
+CSS_COLLAPSE_RE = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?:\s|/\*.*?\*/)+''', re.DOTALL)
+CSS_PUNCT_RE = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')| ?([{};,]) ?|: ''')
+
+
+class _NumericCharFilter(dict):
+    """str.translate table that keeps decimal digits and ``keep``, deleting the rest.
+    
+    Entries are filled in on first sight of each character, so after warm-up
+    translate() runs entirely on C-level dict hits. Digits are tested with
+    str.isdecimal(), the same Unicode category (Nd) the regex digit class uses.
+    """
+    
+    def __init__(self, keep: str):
+        super().__init__()
+        self.keep = keep
+    
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        value = codepoint if char.isdecimal() or char in self.keep else None
+        self[codepoint] = value
+        return value
+
+
+NUMERIC_CHARS = _NumericCharFilter('.-')
+NUMERIC_LINE_CHARS = _NumericCharFilter('.-\n')
+
+
+def _keyword_alternation(keywords) -> str:
+    """Join keywords into one regex alternation, longest first so prefixes never win."""
+    return '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+
+
+# Header keywords that decide whether (and how) a table becomes a chart
+SKIP_KEYWORDS = frozenset({
+    'authority score', 'authority', 'domain score',
+    '权威分数', '域名评分',
+})
+TIME_KEYWORDS = frozenset({
+    'month', 'date', 'period', 'time', 'year', 'quarter', 'week', 'day',
+    '月份', '时间', '日期', '年份', '季度',
+    'mom', 'yoy', 'trend', 'history', 'historical',
+})
+SHARE_KEYWORDS = frozenset({'%', 'share', 'ratio', 'percent', 'proportion', '占比', '比例', '份额'})
+METRIC_KEYWORDS = frozenset({
+    'traffic', 'keywords', 'volume', 'visits', 'count', 'score', 'rank',
+    'backlink', 'domain', 'revenue', 'users', 'sessions', 'pageviews',
+    'organic', 'paid', 'cpc', 'ctr', 'impressions', 'clicks',
+    '流量', '关键词', '排名', '得分', '用户', '访问',
+})
+MONTHS = frozenset({
+    'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+    'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+    'january', 'february', 'march', 'april', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december',
+})
+
+# One scan of the header text reports every keyword bucket it touches. The
+# groups sit inside a lookahead so overlapping keywords (e.g. "domain score"
+# and "domain") are each seen; m.lastgroup names the bucket that matched.
+CATEGORY_RE = re.compile('(?=' + '|'.join(
+    f'(?P<{name}>{_keyword_alternation(keywords)})'
+    for name, keywords in (
+        ('skip', SKIP_KEYWORDS),
+        ('time', TIME_KEYWORDS),
+        ('share', SHARE_KEYWORDS),
+        ('metric', METRIC_KEYWORDS),
+    )
+) + ')')
+
+# A first-column cell looks like a date if it contains a month name as a whole
+# word, or starts with 2024-01 / 01-2024 style dates or a quarter (Q1..Q4)
+DATE_ANY_RE = re.compile(
+    r'(?<![a-z])(?:' + _keyword_alternation(MONTHS) + r')(?![a-z])'
+    r'|^(?:\d{4}[-/]\d{2}|\d{2}[-/]\d{4}|q[1-4])'
+)
+
 
 def get_report_tools() -> list:
     """Get report generation tools.
@@ -35,9 +142,9 @@ def get_report_tools() -> list:
     # ============================================================
     if enabled.get("markdown_to_html_report", True):
         try:
-            import markdown
-            from markdown.extensions.tables import TableExtension
-            from markdown.extensions.fenced_code import FencedCodeExtension
+            # Only check availability here; the package is imported on first use
+            if importlib.util.find_spec("markdown") is None:
+                raise ImportError("No module named 'markdown'")
             
             def markdown_to_html_report(
                 markdown_content: str,
@@ -100,20 +207,13 @@ def get_report_tools() -> list:
                 """
                 try:
                     # Convert Markdown to HTML
-                    md = markdown.Markdown(
-                        extensions=[
-                            TableExtension(),
-                            FencedCodeExtension(),
-                            'extra',
-                            'codehilite',
-                            'toc'
-                        ]
-                    )
-                    html_content = md.convert(markdown_content)
+                    with _markdown_lock:
+                        html_content = _get_markdown_converter().reset().convert(markdown_content)
                     
                     # Extract tables for chart generation
-                    tables = _extract_tables(markdown_content)
-                    chart_configs = _generate_chart_configs(tables)
+                    tables = _extract_tables(markdown_content) if '|' in markdown_content else []
+                    # Materialized because the chart count is reported back below
+                    chart_configs = list(_generate_chart_configs(tables)) if tables else []
                     
                     # Generate complete HTML with styling and Chart.js
                     full_html = _generate_html_template(
@@ -123,23 +223,27 @@ def get_report_tools() -> list:
                     )
                     
                     # Save to file - both in workspace root (for artifacts) and reports/ (for archive)
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"report_{timestamp}.html"
+                    # Nanosecond timestamp plus a random suffix so reports generated
+                    # in the same second don't overwrite each other
+                    filename = f"report_{time.time_ns()}_{os.urandom(3).hex()}.html"
                     
                     # Get workspace root directory (parent of deepagents/)
                     workspace_root = Path(__file__).parent.parent.parent
                     
+                    # Encode once; the same bytes go to every copy
+                    html_bytes = full_html.encode('utf-8')
+                    
                     # Save to workspace root directory for artifacts display
                     root_filepath = workspace_root / filename
-                    with open(root_filepath, 'w', encoding='utf-8') as f:
-                        f.write(full_html)
+                    root_filepath.write_bytes(html_bytes)
                     
-                    # Also save to reports/ directory for archiving
+                    # Also save to reports/ directory for archiving, with a gzip
+                    # copy a static server can send as Content-Encoding: gzip
                     output_dir = Path("reports")
                     output_dir.mkdir(exist_ok=True)
                     archive_filepath = output_dir / filename
-                    with open(archive_filepath, 'w', encoding='utf-8') as f:
-                        f.write(full_html)
+                    archive_filepath.write_bytes(html_bytes)
+                    (output_dir / f"{filename}.gz").write_bytes(gzip.compress(html_bytes, compresslevel=6))
                     
                     filepath = root_filepath  # Use root path for return value
 
@@ -209,9 +313,9 @@ def get_report_tools() -> list:
     # ============================================================
     if enabled.get("markdown_to_docx", True):
         try:
-            from docx import Document
-            from docx.shared import Inches, Pt, RGBColor
-            from docx.enum.style import WD_STYLE_TYPE
+            # Only check availability here; the package is imported on first use
+            if importlib.util.find_spec("docx") is None:
+                raise ImportError("No module named 'docx'")
             
             def markdown_to_docx(
                 markdown_content: str,
@@ -229,60 +333,29 @@ def get_report_tools() -> list:
                     Command object to update artifacts, or dict with error message
                 """
                 try:
+                    from docx import Document
+                    
                     document = Document()
                     
                     # Set document styles
                     _setup_docx_styles(document)
                     
-                    # Parse and add content
+                    # Resolve paragraph styles once instead of by name per paragraph
+                    paragraph_styles = {
+                        name: document.styles[name]
+                        for name in ('Code', 'Quote', 'List Bullet', 'List Number')
+                    }
+                    
+                    # Parse and add content, dispatching on the first character
+                    # of each line; handlers return the index of the next line
                     lines = markdown_content.split('\n')
                     i = 0
                     while i < len(lines):
                         line = lines[i]
-                        
-                        # Headers
-                        if line.startswith('# '):
-                            document.add_heading(line[2:], level=1)
-                        elif line.startswith('## '):
-                            document.add_heading(line[3:], level=2)
-                        elif line.startswith('### '):
-                            document.add_heading(line[4:], level=3)
-                        elif line.startswith('#### '):
-                            document.add_heading(line[5:], level=4)
-                        
-                        # Tables
-                        elif line.startswith('|') and '|' in line:
-                            table_lines, i = _extract_table_lines(lines, i)
-                            if table_lines:
-                                _add_table_to_docx(document, table_lines)
-                            i -= 1  # Adjust for increment
-                        
-                        # Code blocks
-                        elif line.startswith('```'):
-                            code_lines, i = _extract_code_block(lines, i)
-                            if code_lines:
-                                p = document.add_paragraph('\n'.join(code_lines))
-                                p.style = 'Code'
-                            i -= 1
-                        
-                        # Blockquotes
-                        elif line.startswith('> '):
-                            document.add_paragraph(line[2:], style='Quote')
-                        
-                        # Lists
-                        elif line.strip().startswith('- ') or line.strip().startswith('* '):
-                            document.add_paragraph(line.strip()[2:], style='List Bullet')
-                        elif re.match(r'^\d+\.\s', line.strip()):
-                            text = re.sub(r'^\d+\.\s', '', line.strip())
-                            document.add_paragraph(text, style='List Number')
-                        
-                        # Regular paragraphs
-                        elif line.strip():
-                            # Remove Markdown formatting
-                            clean_text = _clean_markdown(line)
-                            document.add_paragraph(clean_text)
-                        
-                        i += 1
+                        handler = _DOCX_BLOCK_HANDLERS.get(line[:1]) or _DOCX_LIST_HANDLERS.get(
+                            line.lstrip()[:1], _add_docx_paragraph
+                        )
+                        i = handler(document, lines, i, paragraph_styles)
                     
                     # Save document
                     output_dir = Path("reports")
@@ -349,86 +422,114 @@ def get_report_tools() -> list:
 # Helper Functions
 # ============================================================
 
+# Markdown instances keep per-document state, so the shared converter is
+# reset and used under a lock
+_markdown_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_markdown_converter():
+    """Build the Markdown converter on first use."""
+    import markdown
+    from markdown.extensions.tables import TableExtension
+    from markdown.extensions.fenced_code import FencedCodeExtension
+    
+    return markdown.Markdown(
+        extensions=[
+            TableExtension(),
+            FencedCodeExtension(),
+            'extra',
+            'codehilite',
+            'toc'
+        ]
+    )
+
+
 def _extract_tables(markdown_content: str) -> list:
-    """Extract tables from Markdown content."""
+    """Extract tables (runs of lines starting with '|') from Markdown content."""
     tables = []
-    lines = markdown_content.split('\n')
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i]
-        if line.startswith('|') and '|' in line:
-            table_lines = []
-            while i < len(lines) and lines[i].startswith('|'):
-                table_lines.append(lines[i])
-                i += 1
-            if len(table_lines) > 2:  # Header + separator + data
-                tables.append(table_lines)
-            continue
-        i += 1
+    for match in TABLE_BLOCK_RE.finditer(markdown_content):
+        table_lines = match.group(0).rstrip('\n').split('\n')
+        if len(table_lines) > 2:  # Header + separator + data
+            tables.append(table_lines)
     
     return tables
 
 
-def _generate_chart_configs(tables: list) -> list:
+def _split_table_row(line: str) -> list:
+    """Split a Markdown table row into stripped cells (outer pipes optional).
+    
+    Only one pipe is removed from each edge, so an empty first or last
+    cell ("| a ||") is kept rather than merged into the border.
+    """
+    return list(map(str.strip, line.strip().removeprefix('|').removesuffix('|').split('|')))
+
+
+def _generate_chart_configs(tables: list) -> Iterator[dict]:
     """Generate Chart.js configurations from tables.
     
     Parses each Markdown table, detects appropriate chart type,
-    and generates Chart.js configuration with proper styling.
-    Can return multiple charts per table if datasets need splitting.
+    and yields Chart.js configurations with proper styling.
+    Can yield multiple charts per table if datasets need splitting.
     """
-    chart_configs = []
-    
     for idx, table in enumerate(tables):
         try:
             # Parse table header
-            headers = [h.strip() for h in table[0].split('|')[1:-1]]
+            headers = _split_table_row(table[0])
             if len(headers) < 2:
                 continue
             
             # ❌ Skip tables that should NOT become charts
             # Authority Score tables should display as plain tables with red bold values
-            header_text = ' '.join([h.lower() for h in headers])
-            skip_keywords = [
-                'authority score', 'authority', 'domain score',
-                '权威分数', '域名评分'
-            ]
-            if any(kw in header_text for kw in skip_keywords):
+            categories = _classify_headers(headers)
+            if 'skip' in categories:
                 logger.debug(f"[REPORTS] Skipping chart for Authority Score table {idx}")
                 continue
             
-            # Parse data rows (skip separator line)
+            # Parse data rows (skip separator line); the first column doubles
+            # as date candidates for detection and as the chart labels
             data_rows = []
+            first_col = []
             for row in table[2:]:  # Skip separator
-                cells = [c.strip() for c in row.split('|')[1:-1]]
+                cells = _split_table_row(row)
                 if cells and len(cells) >= 2:
                     data_rows.append(cells)
+                    first_col.append(cells[0])
             
             # Need at least 2 data rows for meaningful chart
             if len(data_rows) < 2:
                 continue
             
             # Detect chart type based on headers and data
-            chart_type = _detect_chart_type(headers, data_rows)
+            chart_type = _detect_chart_type(headers, data_rows, categories, first_col)
             if not chart_type:
                 continue
             
+            # Convert the value cells to numbers once; datasets slice columns from this
+            numbers = iter(_extract_numbers([cell for row in data_rows for cell in row[1:]]))
+            numeric_rows = [list(itertools.islice(numbers, len(row) - 1)) for row in data_rows]
+            
             # Generate Chart.js config (may return single config or list)
-            config = _create_chart_config(chart_type, headers, data_rows, idx)
+            config = _create_chart_config(chart_type, headers, first_col, numeric_rows, idx)
             if config:
                 # Handle both single config and list of configs
                 if isinstance(config, list):
-                    chart_configs.extend(config)
+                    yield from config
                 else:
-                    chart_configs.append(config)
+                    yield config
                 
         except Exception as e:
             logger.debug(f"[REPORTS] Could not parse table {idx}: {e}")
-    
-    return chart_configs
 
 
-def _detect_chart_type(headers: list, data_rows: list) -> str:
+def _classify_headers(headers: list) -> set:
+    """Return the keyword buckets (skip/time/share/metric) found in the headers."""
+    return {m.lastgroup for m in CATEGORY_RE.finditer(' '.join(headers).lower())}
+
+
+def _detect_chart_type(
+    headers: list, data_rows: list, categories: set = None, first_col: list = None
+) -> str:
     """Detect appropriate chart type based on table structure.
     
     Detection logic (priority order):
@@ -437,97 +538,64 @@ def _detect_chart_type(headers: list, data_rows: list) -> str:
     3. Metric keywords in headers → Bar Chart
     4. Has numeric data columns → Bar Chart
     5. No numeric data → None (no chart)
+    
+    ``categories`` (the result of ``_classify_headers``) and ``first_col``
+    (each row's first cell) may be passed in when the caller already has them.
     """
     if len(headers) < 2 or len(data_rows) < 2:
         return None
     
-    # Normalize headers for keyword matching
-    header_lower = [h.lower() for h in headers]
-    header_text = ' '.join(header_lower)
+    if categories is None:
+        categories = _classify_headers(headers)
     
     # 1️⃣ Time-series data → Line Chart (strict validation)
-    time_keywords = [
-        'month', 'date', 'period', 'time', 'year', 'quarter', 'week', 'day',
-        '月份', '时间', '日期', '年份', '季度',
-        'mom', 'yoy', 'trend', 'history', 'historical'
-    ]
-    
     # First check if headers suggest time-series
-    has_time_keywords = any(kw in header_text for kw in time_keywords)
+    has_time_keywords = 'time' in categories
     
     # Then verify first column contains actual date/time patterns
-    first_col = [row[0] for row in data_rows if row]
+    if first_col is None:
+        first_col = [row[0] for row in data_rows if row]
     has_valid_dates = False
     
     if first_col and has_time_keywords:
-        # Count how many rows have date-like patterns
+        # At least 80% of rows must have valid date patterns; stop counting
+        # as soon as the outcome is decided either way
+        threshold = math.ceil(len(first_col) * 0.8)
         date_count = 0
-        for val in first_col:
-            val_lower = str(val).lower()
-            # Check for month names
-            months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                      'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
-                      'january', 'february', 'march', 'april', 'may', 'june',
-                      'july', 'august', 'september', 'october', 'november', 'december']
-            if any(month in val_lower for month in months):
+        for idx, val in enumerate(first_col):
+            if DATE_ANY_RE.search(str(val).lower()):
                 date_count += 1
-                continue
-            # Check for date formats (2024-01, 2024/01, Q1 2024, etc.)
-            if re.match(r'\d{4}[-/]\d{2}', val_lower) or re.match(r'\d{2}[-/]\d{4}', val_lower):
-                date_count += 1
-                continue
-            # Check for quarter patterns (Q1, Q2, etc.)
-            if re.match(r'q[1-4]', val_lower):
-                date_count += 1
-                continue
-        
-        # At least 80% of rows must have valid date patterns
-        if date_count >= len(first_col) * 0.8:
-            has_valid_dates = True
+                if date_count >= threshold:
+                    has_valid_dates = True
+                    break
+            elif date_count + len(first_col) - idx - 1 < threshold:
+                break
     
     # Only use line chart if BOTH conditions are met
     if has_time_keywords and has_valid_dates:
         return 'line'
     
     # 2️⃣ Percentage/share data → Pie Chart (Doughnut)
-    share_keywords = ['%', 'share', 'ratio', 'percent', 'proportion', '占比', '比例', '份额']
-    if any(kw in header_text for kw in share_keywords):
+    if 'share' in categories:
         # Only use pie chart if there are few data rows (<=8)
         if len(data_rows) <= 8:
             return 'pie'
         return 'bar'  # Too many slices, use bar instead
     
     # 3️⃣ Metric keywords → Bar Chart (includes domain comparisons)
-    metric_keywords = [
-        'traffic', 'keywords', 'volume', 'visits', 'count', 'score', 'rank',
-        'backlink', 'domain', 'revenue', 'users', 'sessions', 'pageviews',
-        'organic', 'paid', 'cpc', 'ctr', 'impressions', 'clicks',
-        '流量', '关键词', '排名', '得分', '用户', '访问'
-    ]
-    if any(kw in header_text for kw in metric_keywords):
+    if 'metric' in categories:
         return 'bar'
     
-    # 4️⃣ Check if there are numeric columns (fallback detection)
-    numeric_col_count = 0
+    # 4️⃣ Check if there are numeric columns (fallback detection);
+    # one column with at least 50% numeric cells is enough for a bar chart
+    threshold = len(data_rows) * 0.5
     for col_idx in range(1, len(headers)):
         numeric_count = 0
         for row in data_rows:
-            if len(row) > col_idx:
-                val = row[col_idx]
-                if val and re.search(r'\d', val):
-                    # Try to extract number
-                    cleaned = re.sub(r'[^\d.\-]', '', val)
-                    try:
-                        float(cleaned)
-                        numeric_count += 1
-                    except ValueError:
-                        pass
-        # At least 50% of rows have numeric data in this column
-        if numeric_count >= len(data_rows) * 0.5:
-            numeric_col_count += 1
-    
-    if numeric_col_count > 0:
-        return 'bar'
+            if len(row) > col_idx and NUMERIC_CELL_RE.fullmatch(row[col_idx]):
+                numeric_count += 1
+        if numeric_count >= threshold:
+            return 'bar'
     
     # 5️⃣ No chart if no numeric data detected
     return None
@@ -548,7 +616,7 @@ def _extract_number(value: str) -> float:
         return 0
     
     # Remove common prefixes/suffixes but keep negative sign
-    cleaned = re.sub(r'[^\d.\-]', '', value)
+    cleaned = value.translate(NUMERIC_CHARS)
     
     try:
         return float(cleaned) if cleaned else 0
@@ -556,17 +624,45 @@ def _extract_number(value: str) -> float:
         return 0
 
 
-# Chart color palette (Minimal 2-Color: Blue #3b82f6 + Slate #475569)
-CHART_COLORS = [
-    {'bg': 'rgba(59, 130, 246, 0.7)', 'border': 'rgb(59, 130, 246)'},     # Primary: Blue
-    {'bg': 'rgba(71, 85, 105, 0.7)', 'border': 'rgb(71, 85, 105)'},       # Secondary: Slate
-    {'bg': 'rgba(59, 130, 246, 0.4)', 'border': 'rgb(59, 130, 246)'},     # Blue (lighter)
-    {'bg': 'rgba(71, 85, 105, 0.4)', 'border': 'rgb(71, 85, 105)'},       # Slate (lighter)
-    {'bg': 'rgba(59, 130, 246, 0.2)', 'border': 'rgb(59, 130, 246)'},     # Blue (very light)
-    {'bg': 'rgba(71, 85, 105, 0.2)', 'border': 'rgb(71, 85, 105)'},       # Slate (very light)
-]
+def _extract_numbers(values: list) -> list:
+    """Extract numeric values from many cells at once.
+    
+    Same rules as _extract_number, but the cells are joined and cleaned with a
+    single translate() call instead of one per cell. Table cells come
+    from single Markdown lines, so they never contain the newline separator.
+    """
+    if not values:
+        return []
+    
+    numbers = []
+    for cleaned in '\n'.join(values).translate(NUMERIC_LINE_CHARS).split('\n'):
+        try:
+            numbers.append(float(cleaned) if cleaned else 0)
+        except ValueError:
+            numbers.append(0)
+    return numbers
+
+
+# Chart color palette (Minimal 2-Color: Blue #3b82f6 + Slate #475569);
+# CHART_BG[i] pairs with CHART_BORDER[i]
+CHART_BG = (
+    'rgba(59, 130, 246, 0.7)',     # Primary: Blue
+    'rgba(71, 85, 105, 0.7)',      # Secondary: Slate
+    'rgba(59, 130, 246, 0.4)',     # Blue (lighter)
+    'rgba(71, 85, 105, 0.4)',      # Slate (lighter)
+    'rgba(59, 130, 246, 0.2)',     # Blue (very light)
+    'rgba(71, 85, 105, 0.2)',      # Slate (very light)
+)
+CHART_BORDER = (
+    'rgb(59, 130, 246)',
+    'rgb(71, 85, 105)',
+    'rgb(59, 130, 246)',
+    'rgb(71, 85, 105)',
+    'rgb(59, 130, 246)',
+    'rgb(71, 85, 105)',
+)
 
-PIE_COLORS = [
+PIE_COLORS = (
     'rgba(59, 130, 246, 0.85)',   # Blue
     'rgba(71, 85, 105, 0.85)',    # Slate
     'rgba(59, 130, 246, 0.6)',    # Blue (lighter)
@@ -575,7 +671,22 @@ PIE_COLORS = [
     'rgba(71, 85, 105, 0.4)',     # Slate (very light)
     'rgba(30, 64, 175, 0.85)',    # Darker Blue
     'rgba(51, 65, 85, 0.85)',     # Darker Slate
-]
+)
+
+
+@dataclass(slots=True)
+class Dataset:
+    """One Chart.js dataset: a table column's label, values and colors."""
+    label: str
+    data: list
+    bg: str
+    border: str
+
+
+# Powers of ten for bucketing dataset averages by order of magnitude; the
+# bisect positions reproduce int(math.log10(avg)) without a float log
+MAGNITUDE_STEPS = tuple(10.0 ** k for k in range(1, 19))
+FRACTION_STEPS = tuple(10.0 ** -k for k in range(18, 0, -1))
 
 
 def _group_datasets_by_magnitude(datasets: list) -> list[list]:
@@ -589,9 +700,11 @@ def _group_datasets_by_magnitude(datasets: list) -> list[list]:
     # Calculate average magnitude for each dataset
     dataset_magnitudes = []
     for ds in datasets:
-        avg_val = sum(abs(v) for v in ds['data']) / len(ds['data']) if ds['data'] else 0
-        if avg_val > 0:
-            magnitude = int(math.log10(avg_val))
+        avg_val = sum(abs(v) for v in ds.data) / len(ds.data) if ds.data else 0
+        if avg_val >= 1:
+            magnitude = bisect.bisect_right(MAGNITUDE_STEPS, avg_val)
+        elif avg_val > 0:
+            magnitude = bisect.bisect_left(FRACTION_STEPS, avg_val) - len(FRACTION_STEPS)
         else:
             magnitude = 0
         dataset_magnitudes.append((ds, magnitude))
@@ -620,6 +733,35 @@ def _group_datasets_by_magnitude(datasets: list) -> list[list]:
     return groups
 
 
+# Label keywords → chart title, in priority order (first group that matches wins)
+LABEL_TITLE_PATTERNS = (
+    # Traffic/Keywords patterns
+    (('traffic', 'kw'), 'Traffic & Keywords Trend'),
+    (('traffic',), 'Traffic Trend'),
+    (('kw', 'keyword'), 'Keyword Trend'),
+    (('mom', '%', 'change'), 'Month-over-Month Change'),
+    # Domain comparison patterns
+    (('seopage', 'writesonic'), 'Domain Comparison'),
+    # Metric patterns
+    (('organic',), 'Organic Search Metrics'),
+    (('paid',), 'Paid Advertising Metrics'),
+    (('backlink', 'ref'), 'Backlink Metrics'),
+    (('authority', 'score'), 'Authority Score Comparison'),
+    # Content patterns
+    (('blog', 'product', 'landing'), 'Content Type Distribution'),
+    (('page', 'content'), 'Page Data'),
+    # Technical patterns
+    (('speed', 'lcp', 'cwv'), 'Technical SEO Metrics'),
+)
+
+# Group t<i> matches any keyword of LABEL_TITLE_PATTERNS[i]; the lookahead lets
+# one scan report every pattern present, so the lowest index is the title
+TITLE_RE = re.compile('(?=' + '|'.join(
+    f'(?P<t{i}>{_keyword_alternation(keywords)})'
+    for i, (keywords, _) in enumerate(LABEL_TITLE_PATTERNS)
+) + ')')
+
+
 def _generate_chart_title_from_labels(labels: list) -> str:
     """Generate a descriptive chart title from dataset labels.
     
@@ -627,33 +769,15 @@ def _generate_chart_title_from_labels(labels: list) -> str:
     """
     if not labels:
         return None
-    
-    # Common label patterns and their English titles
-    label_patterns = {
-        # Traffic/Keywords patterns
-        ('traffic', 'kw'): 'Traffic & Keywords Trend',
-        ('traffic',): 'Traffic Trend',
-        ('kw', 'keyword'): 'Keyword Trend',
-        ('mom', '%', 'change'): 'Month-over-Month Change',
-        # Domain comparison patterns
-        ('seopage', 'writesonic'): 'Domain Comparison',
-        # Metric patterns
-        ('organic',): 'Organic Search Metrics',
-        ('paid',): 'Paid Advertising Metrics',
-        ('backlink', 'ref'): 'Backlink Metrics',
-        ('authority', 'score'): 'Authority Score Comparison',
-        # Content patterns
-        ('blog', 'product', 'landing'): 'Content Type Distribution',
-        ('page', 'content'): 'Page Data',
-        # Technical patterns
-        ('speed', 'lcp', 'cwv'): 'Technical SEO Metrics',
-    }
-    
-    labels_lower = ' '.join(labels).lower()
-    
-    for patterns, title in label_patterns.items():
-        if any(p in labels_lower for p in patterns):
-            return title
+    return _title_for_labels(tuple(labels))
+
+
+@functools.lru_cache(maxsize=256)
+def _title_for_labels(labels: tuple) -> str:
+    """Cached body of _generate_chart_title_from_labels, keyed by the label tuple."""
+    matched = [int(m.lastgroup[1:]) for m in TITLE_RE.finditer(' '.join(labels).lower())]
+    if matched:
+        return LABEL_TITLE_PATTERNS[min(matched)][1]
     
     # Fallback: extract domain names if present
     domains = []
@@ -667,30 +791,25 @@ def _generate_chart_title_from_labels(labels: list) -> str:
     return None
 
 
-def _create_chart_config(chart_type: str, headers: list, data_rows: list, idx: int) -> dict | list:
+def _create_chart_config(
+    chart_type: str, headers: list, labels: list, numeric_rows: list, idx: int
+) -> dict | list:
     """Create Chart.js configuration with proper styling.
     
+    labels is each data row's first cell; numeric_rows holds the parsed
+    numbers for the row's value cells (every cell after the label column).
+    
     Returns either a single chart config dict, or a list of chart configs
     if datasets need to be split due to magnitude differences.
     """
-    labels = [row[0] for row in data_rows if row]
-    
     # Collect all datasets
     datasets = []
     for col_idx in range(1, len(headers)):
-        data = []
-        for row in data_rows:
-            if len(row) > col_idx:
-                data.append(_extract_number(row[col_idx]))
+        data = [row[col_idx - 1] for row in numeric_rows if len(row) >= col_idx]
         
         if data and any(v != 0 for v in data):  # Skip all-zero datasets
-            color = CHART_COLORS[(col_idx - 1) % len(CHART_COLORS)]
-            datasets.append({
-                'label': headers[col_idx],
-                'data': data,
-                'backgroundColor': color['bg'],
-                'borderColor': color['border'],
-            })
+            color_idx = (col_idx - 1) % len(CHART_BG)
+            datasets.append(Dataset(headers[col_idx], data, CHART_BG[color_idx], CHART_BORDER[color_idx]))
     
     if not datasets:
         return None
@@ -724,13 +843,13 @@ def _create_chart_config(chart_type: str, headers: list, data_rows: list, idx: i
         chart_id = f'chart_{idx}_{group_idx}' if group_idx > 0 else f'chart_{idx}'
         
         # Generate meaningful title from dataset labels
-        group_labels = [ds['label'] for ds in group]
+        group_labels = [ds.label for ds in group]
         chart_title = _generate_chart_title_from_labels(group_labels)
         
         # Fallback to numbered title if no pattern matched
         if not chart_title and len(dataset_groups) > 1:
             # Try to describe by magnitude scale
-            avg_val = sum(sum(abs(v) for v in ds['data']) / len(ds['data']) for ds in group) / len(group)
+            avg_val = sum(sum(abs(v) for v in ds.data) / len(ds.data) for ds in group) / len(group)
             if avg_val >= 10000:
                 chart_title = f"Large Scale Metrics (avg {avg_val:,.0f})"
             elif avg_val >= 100:
@@ -750,29 +869,44 @@ def _create_chart_config(chart_type: str, headers: list, data_rows: list, idx: i
     return charts
 
 
-def _extract_h2_sections(content: str) -> list:
-    """Extract H1 and H2 headings from HTML content for hierarchical sidebar navigation.
+def _rewrite_html(content: str, chart_insert_map: dict) -> tuple[list, str]:
+    """Add section ids to H1/H2 headings and insert charts before their tables.
     
-    Returns a list of sections with parent-child relationships:
+    Walks the HTML once and returns the sections for hierarchical sidebar
+    navigation together with the rewritten content:
     - H1 headings become parent navigation items
     - H2 headings become child navigation items under the preceding H1
+    
+    Existing id attributes on the headings are replaced to prevent duplicates.
     """
-    import html as html_module
     sections = []
-    section_idx = 0
-    
-    # Match both <h1> and <h2> tags
-    pattern = r'<(h[12])[^>]*>([^<]+)</h[12]>'
-    matches = re.finditer(pattern, content, re.IGNORECASE)
-    
+    parts = []
     current_parent = None
-    
-    for match in matches:
-        level = match.group(1).lower()
-        title = html_module.unescape(match.group(2).strip())
+    section_idx = 0
+    table_idx = 0
+    last_end = 0
+    
+    for match in HTML_TOKEN_RE.finditer(content):
+        parts.append(content[last_end:match.start()])
+        last_end = match.end()
+        
+        level = match.group(1)
+        if level is None:
+            # <table>: charts generated from this table go right before it
+            charts = chart_insert_map.get(table_idx)
+            if charts:
+                parts.append('\n'.join(charts))
+            parts.append(match.group(0))
+            table_idx += 1
+            continue
+        
+        level = level.lower()
         section_id = f'section-{section_idx}'
         section_idx += 1
+        attrs = ATTR_ID_RE.sub('', match.group(2))
+        parts.append(f'<{level}{attrs} id="{section_id}">{match.group(3)}</{level}>')
         
+        title = html_module.unescape(match.group(3).strip())
         if level == 'h1':
             # H1 becomes a parent navigation item
             current_parent = {
@@ -782,7 +916,7 @@ def _extract_h2_sections(content: str) -> list:
                 'children': []
             }
             sections.append(current_parent)
-        elif level == 'h2':
+        else:
             # H2 becomes a child navigation item
             child = {
                 'id': section_id,
@@ -797,247 +931,29 @@ def _extract_h2_sections(content: str) -> list:
                 # Standalone H2 (no parent H1)
                 sections.append(child)
     
-    return sections
+    parts.append(content[last_end:])
+    return sections, ''.join(parts)
 
 
-def _add_section_ids_to_content(content: str, sections: list) -> str:
-    """Add id attributes to H1 and H2 tags for navigation.
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet.
     
-    Removes any existing IDs to prevent duplicates.
+    Comments and whitespace runs collapse to one space, then the spaces
+    around braces, semicolons and commas, and after colons, are dropped.
     """
-    result = content
-    
-    # First, remove any existing id attributes from h1 and h2 tags
-    result = re.sub(r'<h1([^>]*)\s+id="[^"]*"([^>]*)>', r'<h1\1\2>', result, flags=re.IGNORECASE)
-    result = re.sub(r'<h2([^>]*)\s+id="[^"]*"([^>]*)>', r'<h2\1\2>', result, flags=re.IGNORECASE)
-    
-    # Build separate lists for H1 and H2 IDs
-    h1_ids = []
-    h2_ids = []
-    for section in sections:
-        if section.get('level') == 'parent':
-            h1_ids.append(section['id'])
-            for child in section.get('children', []):
-                h2_ids.append(child['id'])
-        else:
-            h2_ids.append(section['id'])
-    
-    # Add IDs to H1 tags
-    h1_idx = [0]  # Use list for closure mutability
-    def replacer_h1(match):
-        if h1_idx[0] < len(h1_ids):
-            section_id = h1_ids[h1_idx[0]]
-            h1_idx[0] += 1
-            existing_attrs = match.group(1)
-            return f'<h1{existing_attrs} id="{section_id}">'
-        return match.group(0)
-    
-    # Add IDs to H2 tags
-    h2_idx = [0]  # Use list for closure mutability
-    def replacer_h2(match):
-        if h2_idx[0] < len(h2_ids):
-            section_id = h2_ids[h2_idx[0]]
-            h2_idx[0] += 1
-            existing_attrs = match.group(1)
-            return f'<h2{existing_attrs} id="{section_id}">'
-        return match.group(0)
-    
-    # Process H1 first, then H2
-    result = re.sub(r'<h1([^>]*)>', replacer_h1, result, flags=re.IGNORECASE)
-    result = re.sub(r'<h2([^>]*)>', replacer_h2, result, flags=re.IGNORECASE)
-    
-    return result
-
-
-def _generate_html_template(title: str, content: str, chart_configs: list) -> str:
-    """Generate complete HTML with sidebar navigation, Chart.js, and modern styling.
-    
-    Features:
-    - Sidebar navigation based on H2 headings
-    - Blue-Teal-Purple gradient theme
-    - Responsive layout (desktop/tablet/mobile)
-    - Interactive charts with Chart.js
-    - Scroll-based navigation highlighting
-    """
-    # Extract sections for navigation
-    sections = _extract_h2_sections(content)
-    content_with_ids = _add_section_ids_to_content(content, sections)
-    
-    # Remove the first H1 from content (it's already in the header)
-    # Find the first H1 tag and remove it along with its content
-    first_h1_pattern = r'<h1[^>]*>.*?</h1>\s*'
-    content_with_ids = re.sub(first_h1_pattern, '', content_with_ids, count=1, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Generate hierarchical sidebar navigation HTML
-    nav_items_html = ""
-    first_section_id = None
-    
-    for idx, section in enumerate(sections):
-        if first_section_id is None:
-            first_section_id = section['id']
-        
-        if section.get('level') == 'parent':
-            # Parent navigation item (H1)
-            active_class = ' active' if section['id'] == first_section_id else ''
-            nav_items_html += f'''
-        <a href="#{section['id']}" class="nav-item nav-parent{active_class}" data-section="{section['id']}">
-            <span class="nav-text">{section['title']}</span>
-        </a>'''
-            
-            # Add children (H2 items)
-            if section.get('children'):
-                nav_items_html += '<div class="nav-children">'
-                for child in section['children']:
-                    nav_items_html += f'''
-        <a href="#{child['id']}" class="nav-item nav-child" data-section="{child['id']}">
-            <span class="nav-text">{child['title']}</span>
-        </a>'''
-                nav_items_html += '</div>'
-        else:
-            # Standalone H2 (no parent)
-            active_class = ' active' if section['id'] == first_section_id else ''
-            nav_items_html += f'''
-        <a href="#{section['id']}" class="nav-item nav-child{active_class}" data-section="{section['id']}">
-            <span class="nav-text">{section['title']}</span>
-        </a>'''
-    
-    # Generate chart HTML and scripts
-    charts_script = ""
-    chart_insert_map = {}  # Map table index to chart HTML
-    
-    for config in chart_configs:
-        if config is None:
-            continue
-            
-        chart_id = config['id']
-        chart_type = config['type']
-        is_pie = config.get('is_pie', False)
-        
-        # Build datasets JavaScript
-        if is_pie:
-            # For pie charts, use first dataset with pie colors
-            ds = config['datasets'][0] if config['datasets'] else None
-            if ds:
-                pie_colors = str(PIE_COLORS[:len(ds['data'])])
-                datasets_js = f"""[{{
-            label: '{ds['label']}',
-            data: {ds['data']},
-            backgroundColor: {pie_colors},
-            borderColor: 'white',
-            borderWidth: 2
-        }}]"""
-        else:
-            # For bar/line charts
-            datasets_js = "[\n"
-            for ds in config['datasets']:
-                tension = ", tension: 0.3, fill: true" if chart_type == 'line' else ""
-                datasets_js += f"""        {{
-            label: '{ds['label']}',
-            data: {ds['data']},
-            backgroundColor: '{ds['backgroundColor']}',
-            borderColor: '{ds['borderColor']}',
-            borderWidth: 2{tension}
-        }},\n"""
-            datasets_js += "    ]"
-        
-        # Chart options
-        if is_pie:
-            options_js = """{
-        responsive: true,
-        maintainAspectRatio: false,
-        plugins: {
-            legend: {
-                position: 'right',
-                labels: { color: '#374151', font: { size: 12 } }
-            }
-        }
-    }"""
-        else:
-            options_js = """{
-        responsive: true,
-        maintainAspectRatio: false,
-        plugins: {
-            legend: {
-                labels: { color: '#374151', font: { size: 12 } }
-            }
-        },
-        scales: {
-            x: {
-                ticks: { color: '#6b7280' },
-                grid: { color: 'rgba(229, 231, 235, 0.8)' }
-            },
-            y: {
-                ticks: { color: '#6b7280' },
-                grid: { color: 'rgba(229, 231, 235, 0.8)' }
-            }
-        }
-    }"""
-        
-        charts_script += f"""
-new Chart(document.getElementById('{chart_id}'), {{
-    type: '{chart_type}',
-    data: {{
-        labels: {config['labels']},
-        datasets: {datasets_js}
-    }},
-    options: {options_js}
-}});
-"""
-        
-        # Store chart HTML to insert before each table
-        # Extract base table index from chart_id (e.g., "chart_0" -> 0, "chart_0_1" -> 0)
-        table_idx = int(chart_id.split('_')[1])
-        
-        # Generate chart HTML with optional title
-        chart_title_html = ""
-        if config.get('title'):
-            chart_title_html = f'<h4 style="margin: 0 0 16px 0; color: var(--text-secondary); font-size: 0.9rem;">{config["title"]}</h4>'
-        
-        # Group charts by table index
-        if table_idx not in chart_insert_map:
-            chart_insert_map[table_idx] = []
-        
-        chart_insert_map[table_idx].append(f'''
-<div class="chart-section">
-    {chart_title_html}
-    <div class="chart-container">
-        <canvas id="{chart_id}"></canvas>
-    </div>
-</div>''')
-    
-    # Insert charts before their corresponding tables
-    table_pattern = r'<table>'
-    table_matches = list(re.finditer(table_pattern, content_with_ids))
-    
-    # Insert from end to start to preserve indices
-    for idx in sorted(chart_insert_map.keys(), reverse=True):
-        if idx < len(table_matches):
-            pos = table_matches[idx].start()
-            # Join all charts for this table
-            charts_html = '\n'.join(chart_insert_map[idx])
-            content_with_ids = content_with_ids[:pos] + charts_html + content_with_ids[pos:]
-    
-    # Calculate total sections (H1 + H2)
-    total_sections = sum(1 for s in sections if s.get('level') == 'parent')
-    total_sections += sum(len(s.get('children', [])) for s in sections if s.get('level') == 'parent')
-    total_sections += sum(1 for s in sections if s.get('level') != 'parent')
-    
-    # Generate the complete HTML
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    <style>
+    css = CSS_COLLAPSE_RE.sub(lambda m: m.group(1) or ' ', css)
+    css = CSS_PUNCT_RE.sub(lambda m: m.group(1) or m.group(2) or ':', css)
+    return css.strip()
+
+
+# Static stylesheet for HTML reports; minified once at import and inserted
+# into the page shell as-is
+_REPORT_CSS = _minify_css('''\
         /* ============================================
            CSS Variables - Minimal 2-Color Theme
            Primary: Blue #3b82f6 | Secondary: Slate #475569
            ============================================ */
-        :root {{
+        :root {
             /* Backgrounds (Gray/White) */
             --bg-primary: #fafbfc;
             --bg-secondary: #ffffff;
@@ -1081,32 +997,32 @@ new Chart(document.getElementById('{chart_id}'), {{
             --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
             --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
             --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
         /* ============================================
            Base Styles
            ============================================ */
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        html {{
+        html {
             scroll-behavior: smooth;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'PingFang SC', 'Microsoft YaHei', "Segoe UI", Roboto, sans-serif;
             line-height: 1.7;
             color: var(--text-primary);
             background: var(--bg-primary);
             font-size: 14px;
             overflow-x: hidden;
-        }}
+        }
         
         /* Scroll Progress Indicator */
-        .scroll-indicator {{
+        .scroll-indicator {
             position: fixed;
             top: 0;
             left: 0;
@@ -1114,20 +1030,20 @@ new Chart(document.getElementById('{chart_id}'), {{
             background: linear-gradient(90deg, var(--accent-primary), var(--accent-secondary));
             z-index: 200;
             transition: width 0.1s ease-out;
-        }}
+        }
         
         /* ============================================
            Layout
            ============================================ */
-        .layout {{
+        .layout {
             display: flex;
             min-height: 100vh;
-        }}
+        }
         
         /* ============================================
            Sidebar - Enhanced with smooth scrollbar
            ============================================ */
-        .sidebar {{
+        .sidebar {
             width: var(--sidebar-width);
             background: linear-gradient(180deg, var(--bg-sidebar) 0%, #fafbfc 100%);
             border-right: 1px solid var(--border-color);
@@ -1139,53 +1055,52 @@ new Chart(document.getElementById('{chart_id}'), {{
             overflow-x: hidden;
             z-index: 100;
             box-shadow: var(--shadow-sm);
-        }}
+        }
         
         /* Custom Scrollbar */
-        .sidebar::-webkit-scrollbar {{
+        .sidebar::-webkit-scrollbar {
             width: 6px;
-        }}
+        }
         
-        .sidebar::-webkit-scrollbar-track {{
+        .sidebar::-webkit-scrollbar-track {
             background: transparent;
-        }}
+        }
         
-        .sidebar::-webkit-scrollbar-thumb {{
+        .sidebar::-webkit-scrollbar-thumb {
             background: var(--border-color);
             border-radius: 3px;
-        }}
+        }
         
-        .sidebar::-webkit-scrollbar-thumb:hover {{
+        .sidebar::-webkit-scrollbar-thumb:hover {
             background: var(--text-muted);
-        }}
+        }
         
-        .sidebar-header {{
+        .sidebar-header {
             padding: 24px 20px;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
         
-        .sidebar-brand {{
+        .sidebar-brand {
             display: flex;
             align-items: center;
             gap: 8px;
             margin-bottom: 16px;
-        }}
+        }
         
-        .brand-icon {{
+        .brand-icon {
             font-size: 20px;
             background: linear-gradient(135deg, var(--accent-primary), var(--accent-secondary));
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
-            animation: pulse-subtle 3s ease-in-out infinite;
-        }}
+        }
         
-        @keyframes pulse-subtle {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.85; }}
-        }}
+        @keyframes pulse-subtle {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.85; }
+        }
         
-        .brand-text {{
+        .brand-text {
             font-size: 16px;
             font-weight: 700;
             background: linear-gradient(135deg, var(--accent-primary), var(--accent-secondary));
@@ -1193,28 +1108,28 @@ new Chart(document.getElementById('{chart_id}'), {{
             -webkit-text-fill-color: transparent;
             background-clip: text;
             letter-spacing: -0.02em;
-        }}
+        }
         
-        .sidebar-title {{
+        .sidebar-title {
             font-size: 11px;
             font-weight: 600;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             color: var(--text-muted);
-        }}
+        }
         
-        .sidebar-subtitle {{
+        .sidebar-subtitle {
             font-size: 12px;
             color: var(--text-muted);
             margin-top: 4px;
-        }}
+        }
         
         /* Navigation */
-        .nav-section {{
+        .nav-section {
             padding: 16px 12px;
-        }}
+        }
         
-        .nav-label {{
+        .nav-label {
             font-size: 10px;
             font-weight: 600;
             text-transform: uppercase;
@@ -1222,9 +1137,9 @@ new Chart(document.getElementById('{chart_id}'), {{
             color: var(--text-muted);
             padding: 0 8px;
             margin-bottom: 8px;
-        }}
+        }
         
-        .nav-item {{
+        .nav-item {
             display: flex;
             align-items: center;
             gap: 10px;
@@ -1237,9 +1152,9 @@ new Chart(document.getElementById('{chart_id}'), {{
             font-weight: 500;
             transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1);
             position: relative;
-        }}
+        }
         
-        .nav-item::before {{
+        .nav-item::before {
             content: '';
             position: absolute;
             left: 0;
@@ -1250,78 +1165,90 @@ new Chart(document.getElementById('{chart_id}'), {{
             background: linear-gradient(180deg, var(--accent-blue), var(--accent-purple));
             border-radius: 0 2px 2px 0;
             transition: height 0.2s ease;
-        }}
+        }
         
-        .nav-item:hover {{
+        .nav-item:hover {
             background: var(--bg-secondary);
             color: var(--text-primary);
             transform: translateX(2px);
-        }}
+        }
         
-        .nav-item.active {{
+        .nav-item.active {
             background: linear-gradient(135deg, var(--accent-blue-light), var(--accent-purple-light));
             color: var(--accent-blue);
             font-weight: 600;
-        }}
+        }
         
-        .nav-item.active::before {{
+        .nav-item.active::before {
             height: 60%;
-        }}
+        }
         
         /* Parent navigation (h1 categories) */
-        .nav-parent {{
+        .nav-parent {
             font-weight: 600;
             color: var(--text-primary);
             font-size: 0.9rem;
             margin-top: 12px;
-        }}
+        }
         
-        .nav-parent:first-child {{
+        .nav-parent:first-child {
             margin-top: 0;
-        }}
+        }
         
         /* Child navigation (h2 items) */
-        .nav-child {{
+        .nav-child {
             padding-left: 24px;
             font-size: 0.8rem;
             color: var(--text-secondary);
-        }}
+        }
         
-        .nav-children {{
+        .nav-children {
             margin-left: 0;
-        }}
+        }
         
-        .nav-child.active {{
+        .nav-child.active {
             font-weight: 500;
-        }}
+        }
         
-        .nav-text {{
+        .nav-text {
             white-space: nowrap;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
         
         /* ============================================
            Main Content
            ============================================ */
-        .main-content {{
+        .main-content {
             flex: 1;
             margin-left: var(--sidebar-width);
             min-height: 100vh;
-        }}
+        }
         
-        .content-header {{
+        .content-header {
             position: sticky;
             top: 0;
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(8px);
+            background: rgba(255, 255, 255, 0.98);
             border-bottom: 1px solid var(--border-color);
             padding: 32px 48px;
             z-index: 50;
             box-shadow: var(--shadow-sm);
-        }}
+        }
         
-        .content-header h1 {{
+        /* The frosted blur re-samples the content behind the sticky header on
+           every scrolled frame; only browsers that support it on pointer
+           devices pay for it, on a layer of its own */
+        @supports (backdrop-filter: blur(8px)) {
+            @media (hover: hover) {
+                .content-header {
+                    background: rgba(255, 255, 255, 0.95);
+                    backdrop-filter: blur(8px);
+                    will-change: transform;
+                }
+            }
+        }
+        
+        .content-header h1 {
             font-size: 2rem;
             font-weight: 700;
             background: linear-gradient(135deg, var(--accent-primary), var(--accent-secondary));
@@ -1331,33 +1258,33 @@ new Chart(document.getElementById('{chart_id}'), {{
             margin-bottom: 12px;
             letter-spacing: -0.03em;
             line-height: 1.2;
-        }}
+        }
         
-        .content-header-meta {{
+        .content-header-meta {
             font-size: 13px;
             color: var(--text-muted);
-        }}
+        }
         
-        .content-body {{
+        .content-body {
             padding: 40px 48px 80px 48px;
             max-width: 1100px;
-        }}
+        }
         
         /* ============================================
            Content Sections
            ============================================ */
-        .content-section {{
+        .content-section {
             margin-bottom: 16px;
-        }}
+        }
         
-        .section-divider {{
+        .section-divider {
             border: none;
             height: 1px;
             background: linear-gradient(90deg, transparent, var(--border-color), transparent);
             margin: 48px 0;
-        }}
+        }
         
-        .intro-section {{
+        .intro-section {
             background: linear-gradient(135deg, var(--accent-primary-light) 0%, var(--accent-secondary-light) 100%);
             border-radius: 16px;
             padding: 32px;
@@ -1366,9 +1293,9 @@ new Chart(document.getElementById('{chart_id}'), {{
             box-shadow: var(--shadow-sm);
             position: relative;
             overflow: hidden;
-        }}
+        }
         
-        .intro-section::before {{
+        .intro-section::before {
             content: '';
             position: absolute;
             top: -50%;
@@ -1376,22 +1303,34 @@ new Chart(document.getElementById('{chart_id}'), {{
             width: 200%;
             height: 200%;
             background: radial-gradient(circle, rgba(99, 102, 241, 0.1) 0%, transparent 70%);
-            animation: pulse 8s ease-in-out infinite;
             pointer-events: none;
-        }}
+        }
+        
+        @keyframes pulse {
+            0%, 100% { opacity: 0.5; transform: scale(1); }
+            50% { opacity: 1; transform: scale(1.05); }
+        }
         
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 0.5; transform: scale(1); }}
-            50% {{ opacity: 1; transform: scale(1.05); }}
-        }}
+        /* Decorative pulses only run when the user allows motion, and settle
+           after a few cycles instead of repainting for the life of the tab */
+        @media (prefers-reduced-motion: no-preference) {
+            .brand-icon {
+                animation: pulse-subtle 3s ease-in-out 3;
+            }
+            
+            .intro-section::before {
+                animation: pulse 8s ease-in-out 3 forwards;
+                will-change: transform, opacity;
+            }
+        }
         
-        .intro-section > * {{
+        .intro-section > * {
             position: relative;
             z-index: 1;
-        }}
+        }
         
         /* Typography - Enhanced hierarchy */
-        h1 {{
+        h1 {
             font-size: 1.75rem;
             font-weight: 700;
             color: var(--text-primary);
@@ -1402,13 +1341,13 @@ new Chart(document.getElementById('{chart_id}'), {{
             border-image: linear-gradient(90deg, var(--accent-primary), var(--accent-secondary)) 1;
             letter-spacing: -0.02em;
             scroll-margin-top: 100px;
-        }}
+        }
         
-        h1:first-child {{
+        h1:first-child {
             margin-top: 0;
-        }}
+        }
         
-        h2 {{
+        h2 {
             font-size: 1.5rem;
             font-weight: 700;
             color: var(--text-primary);
@@ -1419,78 +1358,78 @@ new Chart(document.getElementById('{chart_id}'), {{
             border-image: linear-gradient(90deg, var(--accent-primary), var(--accent-secondary)) 1;
             letter-spacing: -0.02em;
             scroll-margin-top: 100px;
-        }}
+        }
         
-        h2:first-child {{
+        h2:first-child {
             margin-top: 0;
-        }}
+        }
         
-        h3 {{
+        h3 {
             font-size: 1.125rem;
             font-weight: 600;
             color: var(--text-primary);
             margin-top: 32px;
             margin-bottom: 16px;
             letter-spacing: -0.01em;
-        }}
+        }
         
-        h4 {{
+        h4 {
             font-size: 1rem;
             font-weight: 600;
             color: var(--text-secondary);
             margin-top: 24px;
             margin-bottom: 12px;
-        }}
+        }
         
-        p {{
+        p {
             margin-bottom: 16px;
             color: var(--text-secondary);
             line-height: 1.8;
-        }}
+        }
         
-        strong {{
+        strong {
             color: var(--text-primary);
             font-weight: 600;
-        }}
+        }
         
         /* Lists - Enhanced styling */
-        ul, ol {{
+        ul, ol {
             margin: 16px 0;
             padding-left: 24px;
-        }}
+        }
         
-        li {{
+        li {
             margin-bottom: 10px;
             color: var(--text-secondary);
             line-height: 1.7;
             padding-left: 8px;
-        }}
+        }
         
-        ul li::marker {{
+        ul li::marker {
             color: var(--accent-blue);
-        }}
+        }
         
-        ol li::marker {{
+        ol li::marker {
             font-weight: 600;
             color: var(--accent-blue);
-        }}
+        }
         
         /* Links - make them clearly clickable */
-        a, .report-link {{
+        a, .report-link {
             color: var(--accent-blue);
             text-decoration: none;
             border-bottom: 1px solid transparent;
             transition: all 0.15s ease;
             cursor: pointer;
-        }}
+        }
         
-        a:hover, .report-link:hover {{
+        a:hover, .report-link:hover {
             color: var(--accent-purple);
             border-bottom-color: var(--accent-purple);
-        }}
+        }
         
         /* Blockquotes */
-        blockquote {{
+        blockquote {
             border-left: 3px solid;
             border-image: linear-gradient(180deg, var(--accent-blue), var(--accent-purple)) 1;
             padding: 16px 20px;
@@ -1498,14 +1437,14 @@ new Chart(document.getElementById('{chart_id}'), {{
             background: linear-gradient(135deg, var(--accent-blue-light), var(--accent-purple-light));
             border-radius: 0 8px 8px 0;
             color: var(--text-secondary);
-        }}
+        }
         
-        blockquote p:last-child {{
+        blockquote p:last-child {
             margin-bottom: 0;
-        }}
+        }
         
         /* Code - Enhanced styling */
-        code {{
+        code {
             background: var(--accent-purple-light);
             padding: 3px 8px;
             border-radius: 5px;
@@ -1513,49 +1452,49 @@ new Chart(document.getElementById('{chart_id}'), {{
             font-size: 0.85em;
             color: var(--accent-purple);
             font-weight: 500;
-        }}
+        }
         
-        pre {{
+        pre {
             background: #1e1e2e;
             color: #cdd6f4;
             padding: 16px;
             border-radius: 8px;
             overflow-x: auto;
             margin: 16px 0;
-        }}
+        }
         
-        pre code {{
+        pre code {
             background: none;
             padding: 0;
             color: inherit;
-        }}
+        }
         
         /* Horizontal Rule */
-        hr {{
+        hr {
             border: none;
             border-top: 1px solid var(--border-color);
             margin: 32px 0;
-        }}
+        }
         
         /* ============================================
            Tables - Premium design
            ============================================ */
-        .table-container {{
+        .table-container {
             overflow-x: auto;
             margin: 24px 0;
             border-radius: 12px;
             box-shadow: var(--shadow-sm);
             border: 1px solid var(--border-light);
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             background: var(--bg-secondary);
             font-size: 0.875rem;
-        }}
+        }
         
-        th {{
+        th {
             background: linear-gradient(180deg, var(--bg-sidebar), var(--bg-secondary));
             color: var(--text-primary);
             font-weight: 600;
@@ -1566,95 +1505,104 @@ new Chart(document.getElementById('{chart_id}'), {{
             letter-spacing: 0.5px;
             border-bottom: 2px solid var(--border-color);
             white-space: nowrap;
-        }}
+        }
         
-        td {{
+        td {
             padding: 14px 16px;
             border-bottom: 1px solid var(--border-light);
             color: var(--text-secondary);
-        }}
+        }
         
         /* Authority Score - Red Bold Display */
-        td[data-authority-score] {{
+        td[data-authority-score] {
             color: #ef4444 !important;
             font-weight: 700 !important;
             font-size: 1.1em !important;
-        }}
+        }
+        
+        th.authority-header {
+            background: linear-gradient(180deg, #fee2e2, #ffffff);
+            color: #dc2626;
+        }
+        
+        td.authority-value {
+            color: #dc2626 !important;
+            font-size: 1.3em !important;
+        }
         
         /* Highlight Authority Score column */
         th:has(+ th):nth-last-child(2):contains("Authority"),
-        th:contains("Authority Score") {{
+        th:contains("Authority Score") {
             background: linear-gradient(180deg, #fee2e2, var(--bg-secondary));
-        }}
+        }
         
-        tr:last-child td {{
+        tr:last-child td {
             border-bottom: none;
-        }}
+        }
         
-        tr:hover td {{
+        tr:hover td {
             background: var(--bg-hover);
             transition: background 0.15s ease;
-        }}
+        }
         
         /* Links in tables */
-        .data-table a, .data-table .report-link {{
+        .data-table a, .data-table .report-link {
             color: var(--accent-blue);
             font-weight: 500;
-        }}
+        }
         
-        .data-table a:hover, .data-table .report-link:hover {{
+        .data-table a:hover, .data-table .report-link:hover {
             text-decoration: underline;
-        }}
+        }
         
         /* Badges & Trends */
-        .badge {{
+        .badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 6px;
             font-size: 0.75rem;
             font-weight: 600;
             letter-spacing: 0.3px;
-        }}
+        }
         
-        .badge.success {{
+        .badge.success {
             background: #d1fae5;
             color: var(--success);
-        }}
+        }
         
-        .badge.danger {{
+        .badge.danger {
             background: #fee2e2;
             color: var(--danger);
-        }}
+        }
         
-        .badge.warning {{
+        .badge.warning {
             background: #fef3c7;
             color: var(--warning);
-        }}
+        }
         
         /* Trend indicators with arrows */
-        .trend {{
+        .trend {
             font-weight: 600;
             font-variant-numeric: tabular-nums;
-        }}
+        }
         
-        .trend.up {{
+        .trend.up {
             color: var(--success);
-        }}
+        }
         
-        .trend.up::before {{
+        .trend.up::before {
             content: '↑ ';
             font-size: 1.1em;
-        }}
-        }}
+        }
         
-        .trend.down {{
+        .trend.down {
             color: var(--danger);
-        }}
+        }
         
-        .trend.down::before {{
+        .trend.down::before {
             content: '↓ ';
             font-size: 1.1em;
-        }}
+        }
         
         /* ============================================
            Charts
@@ -1662,7 +1610,7 @@ new Chart(document.getElementById('{chart_id}'), {{
         /* ============================================
            Charts - Enhanced styling
            ============================================ */
-        .chart-section {{
+        .chart-section {
             background: var(--bg-secondary);
             border-radius: 12px;
             padding: 28px;
@@ -1670,148 +1618,162 @@ new Chart(document.getElementById('{chart_id}'), {{
             border: 1px solid var(--border-light);
             box-shadow: var(--shadow-md);
             transition: box-shadow 0.2s ease;
-        }}
+        }
         
-        .chart-section:hover {{
+        .chart-section:hover {
             box-shadow: var(--shadow-lg);
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             position: relative;
             height: 360px;
             width: 100%;
             margin-top: 16px;
-        }}
+        }
         
-        .chart-container canvas {{
+        .chart-container canvas {
             max-height: 350px !important;
-        }}
+        }
         
         /* ============================================
            Footer
            ============================================ */
-        .footer {{
+        .footer {
             margin-top: 64px;
             padding-top: 32px;
             border-top: 1px solid var(--border-light);
             text-align: center;
             font-size: 0.875rem;
             color: var(--text-muted);
-        }}
+        }
         
         /* ============================================
            Badges
            ============================================ */
-        .badge {{
+        .badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 6px;
             font-size: 0.75rem;
             font-weight: 600;
             letter-spacing: 0.3px;
-        }}
+        }
         
-        .badge-success {{
+        .badge-success {
             background: #d1fae5;
             color: var(--success);
-        }}
+        }
         
-        .badge-danger {{
+        .badge-danger {
             background: #fee2e2;
             color: var(--danger);
-        }}
+        }
         
-        .badge-warning {{
+        .badge-warning {
             background: #fef3c7;
             color: var(--warning);
-        }}
+        }
         
         /* ============================================
            Responsive Design
            ============================================ */
-        @media (max-width: 1024px) {{
-            .sidebar {{
+        @media (max-width: 1024px) {
+            .sidebar {
                 width: 220px;
-            }}
+            }
             
-            :root {{
+            :root {
                 --sidebar-width: 220px;
-            }}
+            }
             
             .content-header,
-            .content-body {{
+            .content-body {
                 padding-left: 32px;
                 padding-right: 32px;
-            }}
-        }}
+            }
+        }
         
-        @media (max-width: 800px) {{
-            .sidebar {{
+        @media (max-width: 800px) {
+            .sidebar {
                 display: none;
-            }}
+            }
             
-            .main-content {{
+            .main-content {
                 margin-left: 0;
-            }}
+            }
             
-            .content-header {{
+            .content-header {
                 padding: 24px 20px;
-            }}
+            }
             
-            .content-header h1 {{
+            .content-header h1 {
                 font-size: 1.5rem;
-            }}
+            }
             
-            .content-body {{
+            .content-body {
                 padding: 24px 20px 60px 20px;
-            }}
+            }
             
-            h2 {{
+            h2 {
                 font-size: 1.25rem;
                 margin-top: 32px;
-            }}
+            }
             
-            .table-container {{
+            .table-container {
                 margin: 16px -20px;
                 border-radius: 0;
                 border-left: none;
                 border-right: none;
-            }}
+            }
             
-            .chart-container {{
+            .chart-container {
                 height: 280px;
                 padding: 12px;
-            }}
+            }
             
-            table {{
+            table {
                 font-size: 0.8rem;
-            }}
+            }
             
-            th, td {{
+            th, td {
                 padding: 8px 12px;
-            }}
-        }}
+            }
+        }
         
         /* ============================================
            Print Styles
            ============================================ */
-        @media print {{
-            .sidebar {{
+        @media print {
+            .sidebar {
                 display: none;
-            }}
+            }
             
-            .main-content {{
+            .main-content {
                 margin-left: 0;
-            }}
+            }
             
-            .content-header {{
+            .content-header {
                 position: static;
-            }}
+            }
             
-            .chart-container {{
+            .chart-container {
                 break-inside: avoid;
-            }}
-        }}
+            }
+        }''')
+
+
+# Static page shell for HTML reports; only the $placeholders vary per report
+_HTML_SHELL = string.Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+    $chart_library
+    <style>
+$styles
     </style>
 </head>
 <body>
@@ -1826,25 +1788,25 @@ new Chart(document.getElementById('{chart_id}'), {{
                     <span class="brand-text">SeeNOS.ai</span>
                 </div>
                 <div class="sidebar-title">Table of Contents</div>
-                <div class="sidebar-subtitle">{total_sections} Sections</div>
+                <div class="sidebar-subtitle">$total_sections Sections</div>
             </div>
             <nav class="nav-section">
                 <div class="nav-label">Navigation</div>
-                {nav_items_html}
+                $nav_items_html
             </nav>
         </aside>
         
         <!-- Main Content -->
         <main class="main-content">
             <header class="content-header">
-                <h1>{title}</h1>
+                <h1>$title</h1>
             </header>
             
             <div class="content-body">
-                {content_with_ids}
+                $content
                 
                 <div class="footer">
-                    Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")} | Powered by SeeNOS.ai
+                    Generated: $generated_at | Powered by SeeNOS.ai
                 </div>
             </div>
         </main>
@@ -1856,82 +1818,117 @@ new Chart(document.getElementById('{chart_id}'), {{
         // ====================================
         const scrollIndicator = document.getElementById('scrollIndicator');
         
-        window.addEventListener('scroll', () => {{
-            const docHeight = document.documentElement.scrollHeight - window.innerHeight;
-            const scrollPercent = (window.scrollY / docHeight) * 100;
+        // Scrollable height is cached and refreshed on resize/load (charts and
+        // fonts change it); scroll events write at most once per frame
+        let docHeight = 0;
+        let scrollTicking = false;
+        const measureDocHeight = () => {
+            docHeight = document.documentElement.scrollHeight - window.innerHeight;
+        };
+        const updateScrollIndicator = () => {
+            const scrollPercent = docHeight > 0 ? (window.scrollY / docHeight) * 100 : 0;
             scrollIndicator.style.width = scrollPercent + '%';
-        }});
+            scrollTicking = false;
+        };
+        measureDocHeight();
+        window.addEventListener('resize', measureDocHeight, { passive: true });
+        window.addEventListener('load', measureDocHeight);
+        
+        window.addEventListener('scroll', () => {
+            if (!scrollTicking) {
+                scrollTicking = true;
+                requestAnimationFrame(updateScrollIndicator);
+            }
+        }, { passive: true });
         
         // ====================================
         // Authority Score Enhancement
         // ====================================
-        document.addEventListener('DOMContentLoaded', () => {{
-            // Find all tables
-            const tables = document.querySelectorAll('table');
-            tables.forEach(table => {{
-                const headers = table.querySelectorAll('th');
+        document.addEventListener('DOMContentLoaded', () => {
+            // Read phase: find Authority Score columns and the cells to mark
+            // Header is exactly "authority" or contains "authority score"
+            const authorityHeaderRe = /^authority$$|authority score/;
+            const scoreHeaders = [];
+            const scoreCells = [];
+            const numericScoreCells = [];
+            document.querySelectorAll('table').forEach(table => {
                 let authorityColIndex = -1;
                 
-                // Find Authority Score column
-                headers.forEach((th, index) => {{
-                    const text = th.textContent.trim().toLowerCase();
-                    if (text.includes('authority score') || text === 'authority') {{
+                // Find Authority Score column, reading each header's text once
+                const headers = table.querySelectorAll('th');
+                const headerTexts = Array.from(headers, th => th.textContent.trim().toLowerCase());
+                headerTexts.forEach((text, index) => {
+                    if (authorityHeaderRe.test(text)) {
                         authorityColIndex = index;
-                        th.style.background = 'linear-gradient(180deg, #fee2e2, #ffffff)';
-                        th.style.color = '#dc2626';
-                    }}
-                }});
+                        scoreHeaders.push(headers[index]);
+                    }
+                });
                 
-                // Mark Authority Score cells
-                if (authorityColIndex >= 0) {{
-                    const rows = table.querySelectorAll('tbody tr');
-                    rows.forEach(row => {{
-                        const cells = row.querySelectorAll('td');
-                        if (cells[authorityColIndex]) {{
-                            const cell = cells[authorityColIndex];
-                            cell.setAttribute('data-authority-score', 'true');
-                            // Add visual indicator if numeric
+                // Collect Authority Score cells
+                if (authorityColIndex >= 0) {
+                    table.querySelectorAll('tbody tr').forEach(row => {
+                        const cell = row.querySelectorAll('td')[authorityColIndex];
+                        if (cell) {
+                            scoreCells.push(cell);
+                            // Numeric values get the large red-bold indicator
                             const value = cell.textContent.trim();
-                            if (!isNaN(value) && value !== '') {{
-                                cell.innerHTML = `<strong style="color: #dc2626; font-size: 1.2em;">${{value}}</strong>`;
-                            }}
-                        }}
-                    }});
-                }}
-            }});
-        }});
+                            if (!isNaN(value) && value !== '') {
+                                numericScoreCells.push(cell);
+                            }
+                        }
+                    });
+                }
+            });
+            
+            // Write phase: apply every change in one frame, using classes
+            // instead of inline styles or innerHTML
+            requestAnimationFrame(() => {
+                scoreHeaders.forEach(th => th.classList.add('authority-header'));
+                scoreCells.forEach(cell => cell.setAttribute('data-authority-score', 'true'));
+                numericScoreCells.forEach(cell => cell.classList.add('authority-value'));
+            });
+        });
         
         // ====================================
         // Sidebar Navigation & Scroll Highlighting
         // ====================================
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', function() {
             const navItems = document.querySelectorAll('.nav-item');
             const sections = document.querySelectorAll('h1[id], h2[id]');
             
+            // Section id -> nav item, so highlighting only touches the old
+            // and new active items instead of every link
+            const navById = new Map();
+            navItems.forEach(item => navById.set(item.dataset.section, item));
+            let activeNavItem = document.querySelector('.nav-item.active');
+            const setActiveNavItem = (item) => {
+                if (item === activeNavItem) return;
+                if (activeNavItem) activeNavItem.classList.remove('active');
+                if (item) item.classList.add('active');
+                activeNavItem = item;
+            };
+            
             // Intersection Observer for scroll-based highlighting
-            const observer = new IntersectionObserver((entries) => {{
-                entries.forEach(entry => {{
-                    if (entry.isIntersecting) {{
-                        const id = entry.target.id;
-                        navItems.forEach(item => {{
-                            item.classList.toggle('active', item.getAttribute('data-section') === id);
-                        }});
-                    }}
-                }});
-            }}, {{
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        setActiveNavItem(navById.get(entry.target.id) || null);
+                    }
+                });
+            }, {
                 threshold: 0.3,
                 rootMargin: '-100px 0px -50% 0px'
-            }});
+            });
             
             sections.forEach(section => observer.observe(section));
             
             // Smooth scrolling for navigation clicks
-            navItems.forEach(item => {{
-                item.addEventListener('click', (e) => {{
+            navItems.forEach(item => {
+                item.addEventListener('click', (e) => {
                     e.preventDefault();
                     const targetId = item.getAttribute('href').substring(1);
                     const target = document.getElementById(targetId);
-                    if (target) {{
+                    if (target) {
                         // Get the sticky header height
                         const header = document.querySelector('.content-header');
                         const headerHeight = header ? header.offsetHeight : 0;
@@ -1940,43 +1937,268 @@ new Chart(document.getElementById('{chart_id}'), {{
                         const targetPosition = target.getBoundingClientRect().top + window.pageYOffset - headerHeight - 20;
                         
                         // Smooth scroll to target
-                        window.scrollTo({{
+                        window.scrollTo({
                             top: targetPosition,
                             behavior: 'smooth'
-                        }});
+                        });
                         
                         // Update active state
-                        navItems.forEach(link => link.classList.remove('active'));
-                        item.classList.add('active');
-                    }}
-                }});
-            }});
-        }});
-        
+                        setActiveNavItem(item);
+                    }
+                });
+            });
+        });
+        $charts_script
+    </script>
+</body>
+</html>''')
+
+
+# Chart.js is only pulled in for reports that have charts; defer keeps it off
+# the critical rendering path
+_CHART_LIBRARY_TAG = '<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js" defer></script>'
+
+# Chart bootstrap for reports with charts. Deferred scripts run before
+# DOMContentLoaded, so Chart is available there; each chart is built only
+# when its canvas comes near the viewport (or right before printing).
+_CHARTS_SCRIPT = string.Template('''
         // ====================================
         // Chart.js Configuration
         // ====================================
-        Chart.defaults.color = '#6b7280';
-        Chart.defaults.borderColor = 'rgba(0, 0, 0, 0.06)';
-        Chart.defaults.font.family = "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif";
-        Chart.defaults.font.size = 12;
+        const chartConfigs = {$chart_configs
+        };
+        
+        document.addEventListener('DOMContentLoaded', () => {
+            Chart.defaults.color = '#6b7280';
+            Chart.defaults.borderColor = 'rgba(0, 0, 0, 0.06)';
+            Chart.defaults.font.family = "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif";
+            Chart.defaults.font.size = 12;
+            
+            const pendingCharts = new Map();
+            const initChart = (canvas) => {
+                if (pendingCharts.delete(canvas.id)) {
+                    chartObserver.unobserve(canvas);
+                    new Chart(canvas, chartConfigs[canvas.id]);
+                }
+            };
+            const chartObserver = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) initChart(entry.target);
+                });
+            }, { rootMargin: '200px 0px' });
+            
+            Object.keys(chartConfigs).forEach(id => {
+                const canvas = document.getElementById(id);
+                if (canvas) {
+                    pendingCharts.set(id, canvas);
+                    chartObserver.observe(canvas);
+                }
+            });
+            
+            window.addEventListener('beforeprint', () => {
+                Array.from(pendingCharts.values()).forEach(initChart);
+            });
+        });''')
+
+
+def _render_nav_entry(kind: str, section_id: str, title: str, first_section_id: str) -> str:
+    """Render one flattened sidebar entry: a parent/child link or a children wrapper tag.
+    
+    ``title`` is plain text (headings are unescaped when collected), so it is
+    escaped here exactly once.
+    """
+    if kind == 'open':
+        return '<div class="nav-children">'
+    if kind == 'close':
+        return '</div>'
+    active_class = ' active' if section_id == first_section_id else ''
+    return f'''
+        <a href="#{section_id}" class="nav-item nav-{kind}{active_class}" data-section="{section_id}">
+            <span class="nav-text">{html_module.escape(title)}</span>
+        </a>'''
+
+
+def _generate_html_template(title: str, content: str, chart_configs: Iterable[dict]) -> str:
+    """Generate complete HTML with sidebar navigation, Chart.js, and modern styling.
+    
+    Features:
+    - Sidebar navigation based on H2 headings
+    - Blue-Teal-Purple gradient theme
+    - Responsive layout (desktop/tablet/mobile)
+    - Interactive charts with Chart.js
+    - Scroll-based navigation highlighting
+    """
+    # Generate chart HTML and scripts
+    charts_parts = []
+    chart_insert_map = {}  # Map table index to chart HTML
+    
+    for config in chart_configs:
+        if config is None:
+            continue
+            
+        chart_id = config['id']
+        chart_type = config['type']
+        is_pie = config.get('is_pie', False)
         
-        // Chart.js initialization
-        {charts_script}
-    </script>
-</body>
-</html>'''
+        # Build datasets JavaScript (JSON is valid JS and escapes quotes in labels)
+        if is_pie:
+            # For pie charts, use first dataset with pie colors
+            datasets = [{
+                'label': ds.label,
+                'data': ds.data,
+                'backgroundColor': list(PIE_COLORS[:len(ds.data)]),
+                'borderColor': 'white',
+                'borderWidth': 2,
+            } for ds in config['datasets'][:1]]
+        else:
+            # For bar/line charts
+            line_style = {'tension': 0.3, 'fill': True} if chart_type == 'line' else {}
+            datasets = [{
+                'label': ds.label,
+                'data': ds.data,
+                'backgroundColor': ds.bg,
+                'borderColor': ds.border,
+                'borderWidth': 2,
+                **line_style,
+            } for ds in config['datasets']]
+        datasets_js = json.dumps(datasets, ensure_ascii=False, separators=(',', ':'))
+        labels_js = json.dumps(config['labels'], ensure_ascii=False, separators=(',', ':'))
+        
+        # Chart options
+        if is_pie:
+            options_js = """{
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: {
+                position: 'right',
+                labels: { color: '#374151', font: { size: 12 } }
+            }
+        }
+    }"""
+        else:
+            options_js = """{
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: {
+                labels: { color: '#374151', font: { size: 12 } }
+            }
+        },
+        scales: {
+            x: {
+                ticks: { color: '#6b7280' },
+                grid: { color: 'rgba(229, 231, 235, 0.8)' }
+            },
+            y: {
+                ticks: { color: '#6b7280' },
+                grid: { color: 'rgba(229, 231, 235, 0.8)' }
+            }
+        }
+    }"""
+        
+        charts_parts.append(f"""
+'{chart_id}': {{
+    type: '{chart_type}',
+    data: {{
+        labels: {labels_js},
+        datasets: {datasets_js}
+    }},
+    options: {options_js}
+}},""")
+        
+        # Store chart HTML to insert before each table
+        # Extract base table index from chart_id (e.g., "chart_0" -> 0, "chart_0_1" -> 0)
+        table_idx = int(chart_id.split('_')[1])
+        
+        # Generate chart HTML with optional title
+        chart_title_html = ""
+        if config.get('title'):
+            chart_title_html = f'<h4 style="margin: 0 0 16px 0; color: var(--text-secondary); font-size: 0.9rem;">{html_module.escape(config["title"])}</h4>'
+        
+        # Group charts by table index
+        if table_idx not in chart_insert_map:
+            chart_insert_map[table_idx] = []
+        
+        chart_insert_map[table_idx].append(f'''
+<div class="chart-section">
+    {chart_title_html}
+    <div class="chart-container">
+        <canvas id="{chart_id}"></canvas>
+    </div>
+</div>''')
+    
+    if charts_parts:
+        charts_script = _CHARTS_SCRIPT.substitute(chart_configs=''.join(charts_parts))
+        chart_library = _CHART_LIBRARY_TAG
+    else:
+        charts_script = chart_library = ''
+    
+    # Add section ids and insert charts before their tables in one pass;
+    # content with no headings and no charts has nothing to rewrite
+    has_headings = '<h' in content or '<H' in content
+    if has_headings or chart_insert_map:
+        sections, content_with_ids = _rewrite_html(content, chart_insert_map)
+    else:
+        sections, content_with_ids = [], content
+    
+    # Remove the first H1 from content (it's already in the header)
+    # Find the first H1 tag and remove it along with its content
+    if has_headings:
+        content_with_ids = FIRST_H1_RE.sub('', content_with_ids, count=1)
+    
+    # Generate hierarchical sidebar navigation HTML: flatten the section tree
+    # into (kind, id, title) entries in display order, then render them at once
+    first_section_id = sections[0]['id'] if sections else None
+    nav_entries = []
+    for section in sections:
+        if section['level'] == 'parent':
+            # Parent navigation item (H1) followed by its H2 children
+            nav_entries.append(('parent', section['id'], section['title']))
+            if section['children']:
+                nav_entries.append(('open', None, None))
+                nav_entries.extend(('child', child['id'], child['title']) for child in section['children'])
+                nav_entries.append(('close', None, None))
+        else:
+            # Standalone H2 (no parent)
+            nav_entries.append(('child', section['id'], section['title']))
+    
+    nav_items_html = ''.join(
+        _render_nav_entry(kind, section_id, title, first_section_id)
+        for kind, section_id, title in nav_entries
+    )
+    
+    # Total sections (H1 + H2) is the number of navigation links
+    total_sections = sum(1 for kind, _, _ in nav_entries if kind in ('parent', 'child'))
+    
+    # Generate the complete HTML: every per-report value goes into one
+    # mapping that fills the shared page shell in a single pass
+    context = {
+        'title': html_module.escape(title),
+        'total_sections': total_sections,
+        'nav_items_html': nav_items_html,
+        'content': content_with_ids,
+        'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'charts_script': charts_script,
+        'chart_library': chart_library,
+        'styles': _REPORT_CSS,
+    }
+    html = _HTML_SHELL.substitute(context)
     
     return html
 
 
 def _setup_docx_styles(document):
     """Setup custom styles for Word document."""
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.shared import Pt
+    
     try:
         styles = document.styles
+        style_names = {style.name for style in styles}
         
         # Code style
-        if 'Code' not in [s.name for s in styles]:
+        if 'Code' not in style_names:
             code_style = styles.add_style('Code', WD_STYLE_TYPE.PARAGRAPH)
             code_style.font.name = 'Courier New'
             code_style.font.size = Pt(9)
@@ -1988,72 +2210,157 @@ def _setup_docx_styles(document):
 
 def _extract_table_lines(lines: list, start: int) -> tuple:
     """Extract consecutive table lines."""
-    table_lines = []
-    i = start
-    while i < len(lines) and lines[i].startswith('|'):
-        table_lines.append(lines[i])
-        i += 1
-    return table_lines, i
+    end, n = start, len(lines)
+    while end < n and lines[end].startswith('|'):
+        end += 1
+    return lines[start:end], end
 
 
 def _extract_code_block(lines: list, start: int) -> tuple:
     """Extract code block content."""
-    code_lines = []
-    i = start + 1
-    while i < len(lines) and not lines[i].startswith('```'):
-        code_lines.append(lines[i])
-        i += 1
-    return code_lines, i + 1
+    end, n = start + 1, len(lines)
+    while end < n and not lines[end].startswith('```'):
+        end += 1
+    return lines[start + 1:end], end + 1
 
 
 def _add_table_to_docx(document, table_lines: list):
     """Add a table to Word document."""
     try:
         # Parse table
-        headers = [h.strip() for h in table_lines[0].split('|')[1:-1]]
+        headers = _split_table_row(table_lines[0])
         data_rows = []
         for row in table_lines[2:]:  # Skip separator
-            cells = [c.strip() for c in row.split('|')[1:-1]]
+            cells = _split_table_row(row)
             if cells:
                 data_rows.append(cells)
         
         if not data_rows:
             return
         
-        # Create table
-        table = document.add_table(rows=1, cols=len(headers))
+        # Create the table with every row up front; extra cells in a row are
+        # dropped by zip, as they have no column to go in
+        table = document.add_table(rows=len(data_rows) + 1, cols=len(headers))
         table.style = 'Light Grid Accent 1'
         
-        # Add headers
-        header_cells = table.rows[0].cells
-        for i, header in enumerate(headers):
-            header_cells[i].text = header
-        
-        # Add data rows
-        for row_data in data_rows:
-            row_cells = table.add_row().cells
-            for i, cell_data in enumerate(row_data):
-                if i < len(row_cells):
-                    row_cells[i].text = cell_data
+        # Add headers and data rows
+        for row, row_data in zip(table.rows, itertools.chain([headers], data_rows)):
+            for cell, cell_data in zip(row.cells, row_data):
+                cell.text = _clean_markdown(cell_data)
         
         document.add_paragraph()  # Add spacing
     except Exception as e:
         logger.debug(f"[REPORTS] Error adding table to DOCX: {e}")
 
 
+def _add_docx_heading(document, lines: list, i: int, styles: dict) -> int:
+    """Add an ATX heading (levels 1-4) to Word document."""
+    line = lines[i]
+    level = len(line) - len(line.lstrip('#'))
+    if level > 4 or line[level:level + 1] != ' ':
+        return _add_docx_paragraph(document, lines, i, styles)
+    document.add_heading(line[level + 1:], level=level)
+    return i + 1
+
+
+def _add_docx_table(document, lines: list, i: int, styles: dict) -> int:
+    """Add a Markdown table to Word document."""
+    table_lines, i = _extract_table_lines(lines, i)
+    if table_lines:
+        _add_table_to_docx(document, table_lines)
+    return i
+
+
+def _add_docx_code_block(document, lines: list, i: int, styles: dict) -> int:
+    """Add a fenced code block to Word document."""
+    if not lines[i].startswith('```'):
+        return _add_docx_paragraph(document, lines, i, styles)
+    code_lines, i = _extract_code_block(lines, i)
+    if code_lines:
+        document.add_paragraph('\n'.join(code_lines), style=styles['Code'])
+    return i
+
+
+def _add_docx_quote(document, lines: list, i: int, styles: dict) -> int:
+    """Add a blockquote line to Word document."""
+    line = lines[i]
+    if not line.startswith('> '):
+        return _add_docx_paragraph(document, lines, i, styles)
+    document.add_paragraph(line[2:], style=styles['Quote'])
+    return i + 1
+
+
+def _add_docx_bullet_item(document, lines: list, i: int, styles: dict) -> int:
+    """Add a bulleted list item to Word document."""
+    text = lines[i].strip()
+    if not text.startswith(('- ', '* ')):
+        return _add_docx_paragraph(document, lines, i, styles)
+    document.add_paragraph(text[2:], style=styles['List Bullet'])
+    return i + 1
+
+
+def _add_docx_numbered_item(document, lines: list, i: int, styles: dict) -> int:
+    """Add a numbered list item to Word document."""
+    text = lines[i].strip()
+    match = NUMBERED_ITEM_RE.match(text)
+    if not match:
+        return _add_docx_paragraph(document, lines, i, styles)
+    document.add_paragraph(text[match.end():], style=styles['List Number'])
+    return i + 1
+
+
+def _add_docx_paragraph(document, lines: list, i: int, styles: dict) -> int:
+    """Add a regular paragraph to Word document, skipping blank lines."""
+    line = lines[i]
+    if line.strip():
+        # Remove Markdown formatting
+        document.add_paragraph(_clean_markdown(line))
+    return i + 1
+
+
+# Block-level syntax must start at column 0
+_DOCX_BLOCK_HANDLERS = {
+    '#': _add_docx_heading,
+    '|': _add_docx_table,
+    '`': _add_docx_code_block,
+    '>': _add_docx_quote,
+}
+
+# List markers may be indented, so these are keyed on the stripped line
+_DOCX_LIST_HANDLERS = {
+    '-': _add_docx_bullet_item,
+    '*': _add_docx_bullet_item,
+    **dict.fromkeys('0123456789', _add_docx_numbered_item),
+}
+
+
+# Longer texts are cleaned without caching so the cache stays small
+CLEAN_MARKDOWN_CACHE_MAX_LEN = 512
+
+
 def _clean_markdown(text: str) -> str:
-    """Remove Markdown formatting from text."""
-    # Remove bold/italic
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'__([^_]+)__', r'\1', text)
-    text = re.sub(r'_([^_]+)_', r'\1', text)
+    """Remove Markdown formatting from text.
     
-    # Remove inline code
-    text = re.sub(r'`([^`]+)`', r'\1', text)
-    
-    # Remove links
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-    
-    return text
+    One scan handles bold/italic, inline code and links; the text inside
+    emphasis and link labels is cleaned recursively so nested markup like
+    **[label](url)** is stripped too, while code spans are kept verbatim.
+    Short texts such as table cells and headings repeat a lot, so their
+    results are cached.
+    """
+    if len(text) > CLEAN_MARKDOWN_CACHE_MAX_LEN:
+        return MARKDOWN_INLINE_RE.sub(_unwrap_markdown, text)
+    return _clean_markdown_cached(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_markdown_cached(text: str) -> str:
+    """Cached body of _clean_markdown for short texts."""
+    return MARKDOWN_INLINE_RE.sub(_unwrap_markdown, text)
+
+
+def _unwrap_markdown(match: re.Match) -> str:
+    """Replacement for MARKDOWN_INLINE_RE: the unwrapped (and cleaned) inner text."""
+    if match.lastgroup == 'code':
+        return match.group('code')
+    return _clean_markdown(match.group(match.lastgroup))
 
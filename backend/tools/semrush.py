@@ -1,1206 +1,1762 @@
 """Semrush SEO analysis tools."""
 
+import copy
+import csv
+import functools
+import inspect
+import itertools
 import logging
 import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:  # Semrush tools are disabled without requests
+    requests = None
 
 from .config import load_config_file, get_enabled_tools
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://api.semrush.com"
+ANALYTICS_URL = "https://api.semrush.com/analytics/v1"
 
-def get_semrush_tools() -> list:
-    """Get Semrush API tools if API key is configured.
+# Cache lifetimes (seconds) for Semrush responses. Ranks and keyword data move
+# daily at most, history only monthly, and backlink indexes refresh slowly.
+OVERVIEW_TTL = 60 * 60
+HISTORY_TTL = 6 * 60 * 60
+# How long past HISTORY_TTL a history result is still served (and refreshed
+# in the background) instead of making the caller wait for Semrush
+HISTORY_STALE_TTL = 24 * 60 * 60
+BACKLINKS_TTL = 24 * 60 * 60
+# "Nothing found" answers are cached briefly so a retry soon after still works
+NO_DATA_TTL = 5 * 60
+# Failed calls are remembered for a minute so an agent retrying in a loop
+# does not hammer the API (or burn units) on the same error
+FAILURE_TTL = 60
+CACHE_MAX_ENTRIES = 1024
+# Concurrent Semrush requests issued by the batch tools
+BATCH_MAX_WORKERS = 8
+# Client-side throttle, kept under Semrush's per-key request rate limit
+RATE_LIMIT_PER_SECOND = 10
+RATE_LIMIT_BURST = 20
+# Channels reported by the Trends traffic_sources endpoint, in output order
+TRAFFIC_SOURCE_CHANNELS = ("organic", "direct", "referral", "social")
+# Sections semrush_domain_report can fetch, in output order
+DOMAIN_REPORT_SECTIONS = ("overview", "history", "organic_pages", "backlinks")
+
+
+class _NotModified(BaseException):
+    """Raised by _semrush_get when Semrush answers a revalidation with 304.
     
-    Returns:
-        List of tools if Semrush is configured, empty list otherwise.
-        
-    Available tools:
-        - semrush_domain_overview: Get overall SEO metrics for a domain
-        - semrush_domain_overview_batch: Batch analyze multiple domains at once
-        - semrush_domain_history: Get 6-12 month traffic trends (KEY for growth analysis!)
-        - semrush_domain_organic_pages: Get top traffic-driving pages (PSEO detection)
-        - semrush_organic_keywords: Get organic search keywords for a domain
-        - semrush_backlinks_overview: Get backlink profile summary
-        - semrush_backlink_history: Get backlink trend over time
-        - semrush_backlinks_list: Get list of individual backlinks
-        - semrush_keyword_gap: Compare keywords between two domains
-        - semrush_traffic_analytics: Get traffic analytics data
+    Derived from BaseException so it passes through the tools' own
+    ``except Exception`` handlers up to _TTLCache._load, which then keeps
+    serving the cached value.
     """
-    config = load_config_file()
-    semrush_api_key = config.get("semrush_api_key") if config else None
+
+
+class _Revalidation:
+    """ETag / Last-Modified state for the cache load running on this thread.
     
-    if not semrush_api_key:
-        semrush_api_key = os.environ.get("SEMRUSH_API_KEY")
+    _TTLCache._load installs one per load, seeded with the validators of the
+    expired entry being replaced; the first buffered request in that load
+    sends them as conditional headers and records the validators of a fresh
+    200 for the new entry.
+    """
     
-    if not semrush_api_key:
-        logger.info("[SEMRUSH] No Semrush API key configured, SEO tools disabled")
-        return []
+    __slots__ = ("etag", "last_modified", "used")
     
-    try:
-        import requests
+    def __init__(self, etag: str | None = None, last_modified: str | None = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.used = False
+
+
+_revalidation = threading.local()
+
+
+class _TTLCache:
+    """Thread-safe in-process cache with per-entry expiry.
+    
+    Concurrent misses for the same key are coalesced: only one caller runs
+    the loader while the others wait on a per-key lock and reuse its result.
+    Entries may also carry a stale-while-revalidate window past expiry, in
+    which the old value is returned at once while a background thread
+    reloads it. Entries keep the ETag / Last-Modified of the response they
+    were built from, so reloading an expired entry is a conditional request
+    and a 304 simply extends its expiry.
+    """
+    
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries = {}
+        self._locks = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+    
+    def _lookup(self, key):
+        """Return (entry, fresh) for a usable entry, or (None, False)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry[1] > now:
+                return entry, True
+            if entry[2] > now:
+                return entry, False
+        return None, False
+    
+    def get_or_set(self, key, loader, ttl, stale_ttl=0):
+        """Return the cached value for key, calling loader() on a miss.
         
-        BASE_URL = "https://api.semrush.com"
-        ANALYTICS_URL = "https://api.semrush.com/analytics/v1"
+        ttl and stale_ttl are numbers of seconds or callables mapping the
+        loaded value to seconds; a falsy ttl means the value is not stored.
+        For stale_ttl seconds after expiry the old value is still served
+        while it is refreshed in the background.
+        """
+        entry, fresh = self._lookup(key)
+        if entry is not None:
+            if not fresh:
+                self._refresh_in_background(key, loader, ttl, stale_ttl)
+            return entry[0]
         
-        # ============================================================
-        # Helper Function: Check for Semrush API Errors
-        # ============================================================
-        def check_semrush_error(text: str, domain: str) -> dict | None:
-            """Check if response contains Semrush API error.
-            
-            Semrush API returns errors with HTTP 200 status code!
-            Error format: "ERROR XX :: MESSAGE"
-            
-            Returns:
-                Error dict if error found, None if no error
-            """
-            if text.startswith("ERROR"):
-                logger.warning(f"[SEMRUSH] API error for {domain}: {text[:100]}")
-                
-                # ERROR 50 :: NOTHING FOUND (not really an error, just no data)
-                if "NOTHING FOUND" in text or "ERROR 50" in text:
-                    return {
-                        "success": True,
-                        "no_data": True,
-                        "domain": domain,
-                        "message": "No data found for this domain in Semrush database"
-                    }
-                
-                # ERROR 30 :: NOT ENOUGH UNITS (quota exceeded)
-                if "NOT ENOUGH UNITS" in text or "ERROR 30" in text:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "API quota exceeded. Please check your Semrush account."
-                    }
-                
-                # ERROR 40 :: WRONG KEY (invalid API key)
-                if "WRONG KEY" in text or "ERROR 40" in text:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "Invalid Semrush API key. Please check SEMRUSH_API_KEY configuration."
-                    }
-                
-                # Other errors
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": f"Semrush API error: {text}"
-                }
-            
-            return None
-        
-        # ============================================================
-        # Tool 1: Domain Overview
-        # ============================================================
-        def semrush_domain_overview(
-            domain: str,
-            database: str = "us",
-        ) -> dict:
-            """Get overall SEO metrics for a domain.
-            
-            Returns organic traffic, keywords count, backlinks, and authority score.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                database: Country database code (default 'us'). Options: us, uk, de, fr, etc.
-            
-            Returns:
-                Dictionary with organic_keywords, organic_traffic, authority_score, etc.
-            """
-            try:
-                params = {
-                    "type": "domain_ranks",
-                    "key": semrush_api_key,
-                    "export_columns": "Dn,Rk,Or,Ot,Oc,Ad,At,Ac,Sh,Sv",
-                    "domain": domain,
-                    "database": database,
-                }
-                logger.info(f"[SEMRUSH] Fetching domain overview for {domain} (database: {database})")
-                response = requests.get(BASE_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors (ERROR XX :: MESSAGE)
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    return error_result
-                
-                # Parse CSV response
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    logger.warning(f"[SEMRUSH] Unexpected response format for {domain}: {text[:200]}")
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "Unexpected response format from Semrush API",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                values = [v.strip() for v in lines[1].split(";")]
-                data = dict(zip(headers, values))
-                
-                # Semrush API returns full column names in headers, not abbreviations
-                organic_traffic = data.get("Organic Traffic", data.get("Ot", "0")) or "0"
-                organic_keywords = data.get("Organic Keywords", data.get("Or", "0"))
-                
-                logger.info(f"[SEMRUSH] Successfully fetched data for {domain}: {organic_traffic} organic traffic")
-                
-                return {
-                    "success": True,
-                    "domain": domain,
-                    "database": database,
-                    "rank": data.get("Rank", data.get("Rk", "N/A")),
-                    "organic_keywords": organic_keywords,
-                    "organic_traffic": organic_traffic,
-                    "organic_cost": data.get("Organic Cost", data.get("Oc", "0")),
-                    "adwords_keywords": data.get("Adwords Keywords", data.get("Ad", "0")),
-                    "adwords_traffic": data.get("Adwords Traffic", data.get("At", "0")),
-                    "adwords_cost": data.get("Adwords Cost", data.get("Ac", "0")),
-                }
-            except Exception as e:
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
-                }
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
         
-        # ============================================================
-        # Tool 2: Organic Keywords
-        # ============================================================
-        def semrush_organic_keywords(
-            domain: str,
-            database: str = "us",
-            limit: int = 20,
-        ) -> dict:
-            """Get organic search keywords that a domain ranks for.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                database: Country database code (default 'us')
-                limit: Maximum number of keywords to return (default 20, max 100)
-            
-            Returns:
-                Dictionary with list of keywords, positions, search volumes
-            """
-            try:
-                limit = min(limit, 100)
-                params = {
-                    "type": "domain_organic",
-                    "key": semrush_api_key,
-                    "export_columns": "Ph,Po,Nq,Cp,Ur,Tr,Tc,Kd",
-                    "domain": domain,
-                    "database": database,
-                    "display_limit": limit,
-                    "display_sort": "tr_desc",  # Sort by traffic percentage (descending)
-                }
-                logger.info(f"[SEMRUSH] Fetching organic keywords for {domain} (limit: {limit})")
-                response = requests.get(BASE_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    # If no data, return empty keywords list
-                    if error_result.get("no_data"):
-                        return {
-                            "success": True,
-                            "domain": domain,
-                            "database": database,
-                            "keywords": [],
-                            "total_keywords": 0,
-                            "message": "No organic keywords found in Semrush database"
-                        }
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": True,
-                        "domain": domain,
-                        "database": database,
-                        "keywords": [],
-                        "total_keywords": 0,
-                        "message": "No organic keywords found",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                keywords = []
-                for line in lines[1:]:
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]
-                    data = dict(zip(headers, values))
-                    keywords.append({
-                        "keyword": data.get("Ph", ""),
-                        "position": data.get("Po", ""),
-                        "search_volume": data.get("Nq", "0"),
-                        "cpc": data.get("Cp", "0"),
-                        "url": data.get("Ur", ""),
-                        "traffic_percent": data.get("Tr", "0"),
-                        "traffic_cost": data.get("Tc", "0"),
-                        "difficulty": data.get("Kd", "0"),
-                    })
-                
-                logger.info(f"[SEMRUSH] Found {len(keywords)} keywords for {domain}")
-                return {
-                    "success": True,
-                    "domain": domain,
-                    "database": database,
-                    "total_keywords": len(keywords),
-                    "keywords": keywords,
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching keywords for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
-                }
+        with key_lock:
+            entry, _ = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            return self._load(key, loader, ttl, stale_ttl)
+    
+    def _load(self, key, loader, ttl, stale_ttl, revalidating=False):
+        with self._lock:
+            previous = self._entries.get(key)
+        context = _Revalidation(*previous[3:]) if previous is not None else _Revalidation()
+        outer = getattr(_revalidation, "current", None)
+        _revalidation.current = context
+        try:
+            value = loader()
+        except _NotModified:
+            # Semrush confirmed the expired entry is still current
+            value = previous[0]
+        finally:
+            _revalidation.current = outer
         
-        # ============================================================
-        # Tool 3: Backlinks Overview
-        # ============================================================
-        def semrush_backlinks_overview(
-            domain: str,
-        ) -> dict:
-            """Get backlink profile summary for a domain.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-            
-            Returns:
-                Dictionary with total backlinks, referring domains, authority score
-            """
-            try:
-                params = {
-                    "type": "backlinks_overview",
-                    "key": semrush_api_key,
-                    "target": domain,
-                    "target_type": "root_domain",
-                    "export_columns": "ascore,total,domains_num,urls_num,ips_num,follows_num,nofollows_num",
-                }
-                logger.info(f"[SEMRUSH] Fetching backlinks overview for {domain}")
-                response = requests.get(ANALYTICS_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "Unexpected response format from Semrush API",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                values = [v.strip() for v in lines[1].split(";")]
-                data = dict(zip(headers, values))
-                
-                logger.info(f"[SEMRUSH] Backlinks for {domain}: {data.get('total', '0')} total, {data.get('domains_num', '0')} domains")
-                return {
-                    "success": True,
-                    "domain": domain,
-                    "authority_score": data.get("ascore", "0"),
-                    "total_backlinks": data.get("total", "0"),
-                    "referring_domains": data.get("domains_num", "0"),
-                    "referring_urls": data.get("urls_num", "0"),
-                    "referring_ips": data.get("ips_num", "0"),
-                    "dofollow_links": data.get("follows_num", "0"),
-                    "nofollow_links": data.get("nofollows_num", "0"),
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching backlinks for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
-                }
+        seconds = ttl(value) if callable(ttl) else ttl
+        stale_seconds = stale_ttl(value) if callable(stale_ttl) else stale_ttl
+        if seconds:
+            expires_at = time.monotonic() + seconds
+            with self._lock:
+                # A value that may not be served stale (e.g. a failed refresh)
+                # never replaces the one being revalidated
+                if not (revalidating and not stale_seconds and key in self._entries):
+                    self._store(
+                        key, value, expires_at, expires_at + stale_seconds,
+                        context.etag, context.last_modified,
+                    )
+        return value
+    
+    def _refresh_in_background(self, key, loader, ttl, stale_ttl):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
         
-        # ============================================================
-        # Tool 4: Backlinks List
-        # ============================================================
-        def semrush_backlinks_list(
-            domain: str,
-            limit: int = 20,
-        ) -> dict:
-            """Get list of individual backlinks pointing to a domain.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                limit: Maximum number of backlinks to return (default 20, max 100)
-            
-            Returns:
-                Dictionary with list of backlinks including source URL, anchor text
-            """
+        def refresh():
             try:
-                limit = min(limit, 100)
-                params = {
-                    "type": "backlinks",
-                    "key": semrush_api_key,
-                    "target": domain,
-                    "target_type": "root_domain",
-                    "export_columns": "source_url,source_title,target_url,anchor,external_num,internal_num,first_seen,last_seen",
-                    "display_limit": limit,
-                }
-                logger.info(f"[SEMRUSH] Fetching backlinks list for {domain} (limit: {limit})")
-                response = requests.get(ANALYTICS_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    if error_result.get("no_data"):
-                        return {
-                            "success": True,
-                            "domain": domain,
-                            "backlinks": [],
-                            "total_returned": 0,
-                            "message": "No backlinks found"
-                        }
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": True,
-                        "domain": domain,
-                        "backlinks": [],
-                        "total_returned": 0,
-                        "message": "No backlinks found",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                backlinks = []
-                for line in lines[1:]:
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]
-                    data = dict(zip(headers, values))
-                    backlinks.append({
-                        "source_url": data.get("source_url", ""),
-                        "source_title": data.get("source_title", ""),
-                        "target_url": data.get("target_url", ""),
-                        "anchor_text": data.get("anchor", ""),
-                        "first_seen": data.get("first_seen", ""),
-                        "last_seen": data.get("last_seen", ""),
-                    })
-                
-                logger.info(f"[SEMRUSH] Found {len(backlinks)} backlinks for {domain}")
-                return {
-                    "success": True,
-                    "domain": domain,
-                    "total_returned": len(backlinks),
-                    "backlinks": backlinks,
-                }
+                self._load(key, loader, ttl, stale_ttl, revalidating=True)
             except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching backlinks list for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
-                }
+                logger.warning(f"[SEMRUSH] Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
         
-        # ============================================================
-        # Tool 5: Keyword Gap Analysis
-        # ============================================================
-        def semrush_keyword_gap(
-            target_domain: str,
-            competitor_domain: str,
-            database: str = "us",
-            limit: int = 20,
-        ) -> dict:
-            """Compare keywords between two domains to find gap opportunities.
-            
-            Identifies keywords that the competitor ranks for but target domain does not.
-            
-            Args:
-                target_domain: Your domain (e.g., 'yoursite.com')
-                competitor_domain: Competitor domain (e.g., 'competitor.com')
-                database: Country database code (default 'us')
-                limit: Maximum number of gap keywords to return (default 20, max 100)
-            
-            Returns:
-                Dictionary with keywords that competitor has but you don't
-            """
-            try:
-                limit = min(limit, 100)
-                params = {
-                    "type": "domain_domains",
-                    "key": semrush_api_key,
-                    "domains": f"{target_domain}|{competitor_domain}",
-                    "database": database,
-                    "export_columns": "Dn,Cr,Np,Cp,Nq,Kd",
-                    "display_limit": limit,
-                    "display_filter": "+|Nq|Gt|100",  # Search volume > 100
-                }
-                logger.info(f"[SEMRUSH] Fetching keyword gap: {target_domain} vs {competitor_domain}")
-                response = requests.get(BASE_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "target_domain": target_domain,
-                        "competitor_domain": competitor_domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, f"{target_domain} vs {competitor_domain}")
-                if error_result:
-                    if error_result.get("no_data"):
-                        return {
-                            "success": True,
-                            "target_domain": target_domain,
-                            "competitor_domain": competitor_domain,
-                            "database": database,
-                            "gap_keywords": [],
-                            "total_gaps": 0,
-                            "message": "No keyword gaps found"
-                        }
-                    return {**error_result, "target_domain": target_domain, "competitor_domain": competitor_domain}
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": True,
-                        "target_domain": target_domain,
-                        "competitor_domain": competitor_domain,
-                        "database": database,
-                        "gap_keywords": [],
-                        "total_gaps": 0,
-                        "message": "No keyword gaps found",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                domains = []
-                for line in lines[1:]:
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]
-                    data = dict(zip(headers, values))
-                    domains.append({
-                        "domain": data.get("Dn", ""),
-                        "common_keywords": data.get("Cr", "0"),
-                        "total_keywords": data.get("Np", "0"),
-                        "avg_cpc": data.get("Cp", "0"),
-                        "total_volume": data.get("Nq", "0"),
-                        "avg_difficulty": data.get("Kd", "0"),
-                    })
-                
-                logger.info(f"[SEMRUSH] Found {len(domains)} domain comparison results")
-                return {
-                    "success": True,
-                    "target_domain": target_domain,
-                    "competitor_domain": competitor_domain,
-                    "database": database,
-                    "domains": domains,
-                    "note": "To get specific gap keywords, use semrush_organic_keywords for each domain and compare manually"
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching keyword gap: {e}")
-                return {
-                    "success": False,
-                    "target_domain": target_domain,
-                    "competitor_domain": competitor_domain,
-                    "error": str(e),
-                }
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def _store(self, key, value, expires_at, stale_until, etag=None, last_modified=None):
+        if key not in self._entries and len(self._entries) >= self._max_entries:
+            now = time.monotonic()
+            for stale_key in [k for k, e in self._entries.items() if e[2] <= now]:
+                del self._entries[stale_key]
+                self._locks.pop(stale_key, None)
+            if len(self._entries) >= self._max_entries:
+                oldest = next(iter(self._entries))
+                del self._entries[oldest]
+                self._locks.pop(oldest, None)
+        self._entries[key] = (value, expires_at, stale_until, etag, last_modified)
+    
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._locks.clear()
+
+
+_response_cache = _TTLCache()
+
+
+# Semrush reports failures in the body of an HTTP 200: "ERROR XX :: MESSAGE"
+SEMRUSH_ERROR_RE = re.compile(r"ERROR\s+(\d+)\s*::")
+
+SEMRUSH_ERROR_HANDLERS = {
+    # ERROR 50 :: NOTHING FOUND (not really an error, just no data)
+    50: lambda domain: {
+        "success": True,
+        "no_data": True,
+        "domain": domain,
+        "message": "No data found for this domain in Semrush database"
+    },
+    # ERROR 30 :: NOT ENOUGH UNITS (quota exceeded)
+    30: lambda domain: {
+        "success": False,
+        "domain": domain,
+        "error": "API quota exceeded. Please check your Semrush account."
+    },
+    # ERROR 40 :: WRONG KEY (invalid API key)
+    40: lambda domain: {
+        "success": False,
+        "domain": domain,
+        "error": "Invalid Semrush API key. Please check SEMRUSH_API_KEY configuration."
+    },
+}
+
+
+def _check_semrush_error(text: str, domain: str) -> dict | None:
+    """Check if response contains Semrush API error.
+    
+    Semrush API returns errors with HTTP 200 status code!
+    Error format: "ERROR XX :: MESSAGE"
+    
+    Returns:
+        Error dict if error found, None if no error
+    """
+    # Only the leading bytes can carry the error marker, so avoid scanning
+    # (or copying) a large successful export just to rule it out
+    if not text[:32].lstrip().startswith("ERROR"):
+        return None
+    
+    text = text.strip()
+    logger.warning(f"[SEMRUSH] API error for {domain}: {text[:100]}")
+    
+    match = SEMRUSH_ERROR_RE.match(text)
+    handler = SEMRUSH_ERROR_HANDLERS.get(int(match.group(1))) if match else None
+    if handler is not None:
+        return handler(domain)
+    
+    # Other errors
+    return {
+        "success": False,
+        "domain": domain,
+        "error": f"Semrush API error: {text}"
+    }
+
+
+def _http_error_message(response, prefix: str = "HTTP error") -> str:
+    """Describe a non-200 response with the start of its body.
+    
+    Only the first 200 bytes are read, so a streamed request does not
+    download (and nothing decodes) a whole HTML error page.
+    """
+    snippet = next(response.iter_content(200), b"")
+    return f"{prefix}: {response.status_code} - {snippet.decode('utf-8', 'replace')}"
+
+
+def _http_error(response, prefix: str = "HTTP error", **fields) -> dict:
+    """Tool result for a non-200 response; fields identify the request."""
+    return {"success": False, **fields, "error": _http_error_message(response, prefix)}
+
+
+def _split_semrush_line(line: str) -> list[str]:
+    """Split one export line on ';'.
+    
+    Semrush does not quote its fields, so a plain str.split gives the same
+    cells as csv.reader without the dialect state machine; csv is only used
+    for the rare line that does contain a quote character.
+    """
+    if '"' in line:
+        return next(csv.reader([line], delimiter=";", skipinitialspace=True), [])
+    return line.split(";")
+
+
+def _iter_semrush_csv(lines: Iterable[str]) -> tuple[list[str], Iterator[list[str]]]:
+    """Split a Semrush ';'-separated export into its header and data rows.
+    
+    Rows are produced lazily as lines are consumed. Blank lines are skipped.
+    Semrush does not pad its cells, so data lines are only stripped as a
+    whole (dropping any CRLF remainder) rather than cell by cell; header
+    names, read once, are still stripped individually.
+    """
+    lines = iter(lines)
+    header_line = next(lines, "").strip()
+    headers = [h.strip() for h in _split_semrush_line(header_line)] if header_line else []
+    return headers, (_split_semrush_line(line) for line in map(str.strip, lines) if line)
+
+
+def _read_semrush_csv(text: str) -> tuple[list[str], list[list[str]]]:
+    """Like _iter_semrush_csv, for a fully buffered response body."""
+    headers, rows = _iter_semrush_csv(text.splitlines())
+    return headers, list(rows)
+
+
+# (output key, export column, default) for the row-per-item list exports
+ORGANIC_KEYWORD_COLUMNS = (
+    ("keyword", "Ph", ""),
+    ("position", "Po", ""),
+    ("search_volume", "Nq", "0"),
+    ("cpc", "Cp", "0"),
+    ("url", "Ur", ""),
+    ("traffic_percent", "Tr", "0"),
+    ("traffic_cost", "Tc", "0"),
+    ("difficulty", "Kd", "0"),
+)
+ORGANIC_PAGE_COLUMNS = (
+    ("url", "Ur", ""),
+    ("traffic", "Ot", "0"),
+    ("keywords", "Or", "0"),
+    ("first_keyword", "Fk", ""),
+)
+BACKLINK_COLUMNS = (
+    ("source_url", "source_url", ""),
+    ("source_title", "source_title", ""),
+    ("target_url", "target_url", ""),
+    ("anchor_text", "anchor", ""),
+    ("first_seen", "first_seen", ""),
+    ("last_seen", "last_seen", ""),
+)
+# domain_rank_history headers come back either as full names or short codes
+DOMAIN_HISTORY_COLUMN_MAP = {
+    "Date": "Dt",
+    "Rank": "Rk",
+    "Organic Keywords": "Or",
+    "Organic Traffic": "Ot",
+    "Organic Cost": "Oc",
+    "Adwords Keywords": "Ad",
+    "Adwords Traffic": "At",
+    "Adwords Cost": "Ac",
+}
+DOMAIN_HISTORY_PARAMS = {
+    "type": "domain_rank_history",
+    "export_columns": ",".join(DOMAIN_HISTORY_COLUMN_MAP.values()),
+}
+
+
+def _column_slots(headers: list[str], columns: tuple) -> list[tuple[str, int, str]]:
+    """Resolve each (output key, column, default) to the column's position.
+    
+    Done once per response so rows are read by index rather than through a
+    per-row header dict; a column missing from the export maps to -1.
+    """
+    index = {header: i for i, header in enumerate(headers)}
+    return [(key, index.get(column, -1), default) for key, column, default in columns]
+
+
+def _column_index(index: dict[str, int], *names: str) -> int:
+    """Position of the first of names found in a header index, or -1."""
+    for name in names:
+        if name in index:
+            return index[name]
+    return -1
+
+
+def _cell(values: list[str], i: int, default: str) -> str:
+    """The cell at position i, or default when the column or cell is missing."""
+    return values[i] if 0 <= i < len(values) else default
+
+
+def _url_section_pattern(url: str) -> str | None:
+    """Return the "/section/*" pattern of a page URL's first path segment.
+    
+    Works on absolute URLs (the scheme and host are skipped) as well as on
+    bare paths, slicing out just the first segment instead of splitting the
+    whole URL.
+    """
+    scheme_end = url.find("://")
+    start = url.find("/", scheme_end + 3 if scheme_end >= 0 else 0)
+    if start < 0:
+        return None
+    end = url.find("/", start + 1)
+    return (url[start:end] if end > 0 else url[start:]) + "/*"
+
+
+def _cached_tool(ttl: float, stale_ttl: float = 0):
+    """Cache a Semrush tool's results by its normalized call arguments.
+    
+    Successful results live for ttl seconds, "no data" results for
+    NO_DATA_TTL and failures for FAILURE_TTL. With stale_ttl, an expired
+    successful result keeps being served for that long while it is
+    refreshed in the background. Callers get a deep copy, so mutating a
+    returned result never alters the cached one.
+    """
+    def succeeded(result):
+        return isinstance(result, dict) and result.get("success") and not result.get("no_data")
+    
+    def result_ttl(result):
+        if not isinstance(result, dict) or not result.get("success"):
+            return FAILURE_TTL
+        return NO_DATA_TTL if result.get("no_data") else ttl
+    
+    def result_stale_ttl(result):
+        return stale_ttl if succeeded(result) else 0
+    
+    def decorator(func):
+        signature = inspect.signature(func)
         
-        # ============================================================
-        # Tool 6: Domain Overview Batch (批量分析)
-        # ============================================================
-        def semrush_domain_overview_batch(
-            domains: list,
-            database: str = "us",
-        ) -> dict:
-            """Get SEO metrics for multiple domains at once.
-            
-            Args:
-                domains: List of domains to analyze (e.g., ['site1.com', 'site2.com'])
-                database: Country database code (default 'us')
-            
-            Returns:
-                Dictionary with results for each domain
-            """
-            try:
-                logger.info(f"[SEMRUSH] Batch analysis for {len(domains)} domains: {', '.join(domains)}")
-                results = []
-                success_count = 0
-                
-                for domain in domains:
-                    result = semrush_domain_overview(domain, database)
-                    results.append(result)
-                    if result.get("success") and not result.get("no_data"):
-                        success_count += 1
-                
-                logger.info(f"[SEMRUSH] Batch complete: {success_count}/{len(domains)} domains with data")
-                return {
-                    "success": True,
-                    "database": database,
-                    "total_domains": len(domains),
-                    "domains_with_data": success_count,
-                    "results": results,
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error in batch analysis: {e}")
-                return {
-                    "success": False,
-                    "error": str(e),
-                }
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__, *bound.arguments.values())
+            result = _response_cache.get_or_set(
+                key, lambda: func(*args, **kwargs), result_ttl, result_stale_ttl
+            )
+            return copy.deepcopy(result)
         
-        # ============================================================
-        # Tool 7: Domain History (历史流量趋势 - 关键工具!)
-        # ============================================================
-        def semrush_domain_history(
-            domain: str,
-            database: str = "us",
-            months: int = 6,
-        ) -> dict:
-            """Get historical traffic trends for a domain over time.
-            
-            This is a CRITICAL tool for detecting growth patterns and spikes.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                database: Country database code (default 'us')
-                months: Number of months to retrieve (default 6, max 12)
-            
-            Returns:
-                Dictionary with monthly traffic data, keyword counts, and spike detection
-            """
-            try:
-                from datetime import datetime, timedelta
-                
-                months = min(months, 12)
-                params = {
-                    "type": "domain_rank_history",
-                    "key": semrush_api_key,
-                    "export_columns": "Dt,Rk,Or,Ot,Oc,Ad,At,Ac",
-                    "domain": domain,
-                    "database": database,
-                    "display_limit": months,
-                }
-                
-                # 🔍 CRITICAL: Log the exact API request URL
-                api_url = BASE_URL + "?" + "&".join([f"{k}={v if k != 'key' else 'YOUR_API_KEY'}" for k, v in params.items()])
-                logger.info(f"[SEMRUSH] 🚀 CALLING domain_rank_history API")
-                logger.info(f"[SEMRUSH] 📋 Request Details:")
-                logger.info(f"  - Domain: {domain}")
-                logger.info(f"  - Database: {database}")
-                logger.info(f"  - Months: {months}")
-                logger.info(f"  - API URL: {api_url}")
-                
-                response = requests.get(BASE_URL, params=params, timeout=30)
-                
-                # 🔍 Log response status and content preview
-                logger.info(f"[SEMRUSH] 📥 Response Status: {response.status_code}")
-                logger.info(f"[SEMRUSH] 📄 Response Preview (first 500 chars): {response.text[:500]}")
-                
-                if response.status_code != 200:
-                    error_msg = f"HTTP error: {response.status_code} - {response.text[:200]}"
-                    logger.error(f"[SEMRUSH] ❌ API call failed: {error_msg}")
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": error_msg,
-                        "api_url": api_url,
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    logger.warning(f"[SEMRUSH] ⚠️ API returned error: {error_result.get('error', 'Unknown')}")
-                    error_result["api_url"] = api_url
-                    return error_result
-                
-                lines = text.split("\n")
-                logger.info(f"[SEMRUSH] 📊 Response lines count: {len(lines)}")
-                
-                if len(lines) < 2:
-                    error_msg = "Unexpected response format from Semrush API (less than 2 lines)"
-                    logger.error(f"[SEMRUSH] ❌ {error_msg}")
-                    logger.error(f"[SEMRUSH] Full response: {text}")
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": error_msg,
-                        "api_url": api_url,
-                        "raw_response": text,
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]  # Strip whitespace from headers
-                logger.info(f"[SEMRUSH] 📑 Response headers: {headers}")
-                
-                # Create column mapping from full names to short codes
-                column_map = {
-                    "Date": "Dt",
-                    "Rank": "Rk", 
-                    "Organic Keywords": "Or",
-                    "Organic Traffic": "Ot",
-                    "Organic Cost": "Oc",
-                    "Adwords Keywords": "Ad",
-                    "Adwords Traffic": "At",
-                    "Adwords Cost": "Ac"
-                }
-                
-                history = []
-                prev_traffic = None
-                
-                for line_idx, line in enumerate(lines[1:], 1):
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]  # Strip whitespace from values
-                    data = dict(zip(headers, values))
-                    
-                    # Use column mapping to get correct field names
-                    traffic = int(data.get("Organic Traffic", data.get("Ot", "0")) or "0")
-                    keywords = int(data.get("Organic Keywords", data.get("Or", "0")) or "0")
-                    date_str = data.get("Date", data.get("Dt", ""))
-                    
-                    # 🔍 Log first 3 data rows for verification
-                    if line_idx <= 3:
-                        logger.info(f"[SEMRUSH] 📈 Data row {line_idx}: Date={date_str}, Traffic={traffic}, Keywords={keywords}")
-                    
-                    # Calculate MoM change
-                    mom_change = None
-                    mom_percent = None
-                    if prev_traffic is not None and prev_traffic > 0:
-                        mom_change = traffic - prev_traffic
-                        mom_percent = round((mom_change / prev_traffic) * 100, 1)
-                    
-                    history.append({
-                        "date": date_str,
-                        "rank": data.get("Rank", data.get("Rk", "N/A")),
-                        "organic_keywords": keywords,
-                        "organic_traffic": traffic,
-                        "organic_cost": data.get("Organic Cost", data.get("Oc", "0")),
-                        "mom_change": mom_change,
-                        "mom_percent": mom_percent,
-                    })
-                    
-                    prev_traffic = traffic
-                
-                logger.info(f"[SEMRUSH] ✅ Successfully parsed {len(history)} months of data")
-                
-                # Detect significant fluctuations
-                fluctuations = []
-                for i, month_data in enumerate(history):
-                    if month_data["mom_percent"] is not None:
-                        if abs(month_data["mom_percent"]) >= 15:
-                            fluctuation_type = "spike" if month_data["mom_percent"] > 0 else "drop"
-                            fluctuations.append({
-                                "month": month_data["date"],
-                                "type": fluctuation_type,
-                                "change_percent": month_data["mom_percent"],
-                                "traffic_before": history[i-1]["organic_traffic"],
-                                "traffic_after": month_data["organic_traffic"],
-                            })
-                
-                # Determine if investigation is required
-                requires_investigation = len(fluctuations) > 0
-                investigation_tasks = []
-                if requires_investigation:
-                    logger.info(f"[SEMRUSH] 🔍 Detected {len(fluctuations)} significant fluctuations")
-                    for fluc in fluctuations:
-                        logger.info(f"  - {fluc['month']}: {fluc['type']} ({fluc['change_percent']}%)")
-                        investigation_tasks.append({
-                            "month": fluc["month"],
-                            "type": fluc["type"],
-                            "actions": [
-                                f"Call semrush_domain_organic_pages({domain}) to find page changes",
-                                f"Call web_search('{domain} {fluc['month'][:7]} launch update') to find news",
-                                f"Call web_search('Google algorithm update {fluc['month'][:7]}') to check algorithm changes",
-                            ]
-                        })
-                else:
-                    logger.info(f"[SEMRUSH] ✓ No significant fluctuations detected (all <15% MoM)")
-                
-                result = {
-                    "success": True,
-                    "domain": domain,
-                    "database": database,
-                    "months_analyzed": len(history),
-                    "history": history,
-                    "fluctuation_investigation": {
-                        "requires_investigation": requires_investigation,
-                        "detected_fluctuations": fluctuations,
-                        "investigation_tasks": investigation_tasks,
-                    },
-                    "api_url": api_url,
-                }
-                
-                logger.info(f"[SEMRUSH] 🎉 domain_rank_history completed successfully for {domain}")
-                logger.info(f"[SEMRUSH] Summary: {len(history)} months, {len(fluctuations)} fluctuations")
-                return result
-                
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"[SEMRUSH] ❌ Exception in domain_history for {domain}: {error_msg}")
-                logger.exception(e)  # Log full stack trace
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": error_msg,
-                }
+        return wrapper
+    
+    return decorator
+
+
+# (resolved, key) memo of the config file / environment lookup, so listing
+# the tools again does not re-read model_config.json
+_API_KEY_CACHE: tuple[bool, str | None] = (False, None)
+
+
+def _resolve_api_key() -> str | None:
+    """Return the Semrush API key from the config file or SEMRUSH_API_KEY.
+    
+    The lookup runs once per process; set SEMRUSH_API_KEY_REFRESH=1 (or call
+    _invalidate_api_key()) to pick up a changed key.
+    """
+    global _API_KEY_CACHE
+    if _API_KEY_CACHE[0] and os.environ.get("SEMRUSH_API_KEY_REFRESH") != "1":
+        return _API_KEY_CACHE[1]
+    
+    config = load_config_file()
+    api_key = config.get("semrush_api_key") if config else None
+    if not api_key:
+        api_key = os.environ.get("SEMRUSH_API_KEY")
+    
+    _API_KEY_CACHE = (True, api_key)
+    return api_key
+
+
+def _invalidate_api_key() -> None:
+    global _API_KEY_CACHE
+    _API_KEY_CACHE = (False, None)
+
+
+# Shared by the tool functions below; set by get_semrush_tools() so the tools
+# themselves are built once at import time rather than on every call
+_semrush_api_key: str | None = None
+_session = None
+
+
+class _TokenBucket:
+    """Thread-safe token bucket limiting how fast requests are started.
+    
+    Each acquire() reserves a token, sleeping outside the lock when the
+    bucket is empty, so concurrent callers are spaced out evenly instead of
+    bursting into the API's rate limit.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+_rate_limiter = _TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+
+def _semrush_get(url: str, params: dict, **kwargs):
+    """GET a Semrush endpoint on the shared session, within the rate limit.
+    
+    Inside a cache load (see _Revalidation), the first buffered request sends
+    the expired entry's validators as If-None-Match / If-Modified-Since and
+    raises _NotModified on a 304; a 200 hands its own validators to the new
+    entry. Streamed requests are passed straight through.
+    """
+    _rate_limiter.acquire()
+    context = getattr(_revalidation, "current", None)
+    if kwargs.get("stream") or context is None or context.used:
+        return _session.get(url, params=params, **kwargs)
+    
+    context.used = True
+    headers = {}
+    if context.etag:
+        headers["If-None-Match"] = context.etag
+    if context.last_modified:
+        headers["If-Modified-Since"] = context.last_modified
+    
+    response = _session.get(url, params=params, headers=headers or None, **kwargs)
+    
+    if response.status_code == 304 and headers:
+        response.close()
+        raise _NotModified()
+    
+    if response.status_code == 200:
+        context.etag = response.headers.get("ETag")
+        context.last_modified = response.headers.get("Last-Modified")
+    else:
+        context.etag = context.last_modified = None
+    return response
+
+
+# ============================================================
+# Tool 1: Domain Overview
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_domain_overview(
+    domain: str,
+    database: str = "us",
+) -> dict:
+    """Get overall SEO metrics for a domain.
+    
+    Returns organic traffic, keywords count, backlinks, and authority score.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        database: Country database code (default 'us'). Options: us, uk, de, fr, etc.
+    
+    Returns:
+        Dictionary with organic_keywords, organic_traffic, authority_score, etc.
+    """
+    try:
+        params = {
+            "type": "domain_ranks",
+            "key": _semrush_api_key,
+            "export_columns": "Dn,Rk,Or,Ot,Oc,Ad,At,Ac,Sh,Sv",
+            "domain": domain,
+            "database": database,
+        }
+        logger.info(f"[SEMRUSH] Fetching domain overview for {domain} (database: {database})")
+        response = _semrush_get(BASE_URL, params, timeout=30)
         
-        # ============================================================
-        # Tool 8: Domain Organic Pages (页面分析)
-        # ============================================================
-        def semrush_domain_organic_pages(
-            domain: str,
-            database: str = "us",
-            limit: int = 20,
-        ) -> dict:
-            """Get top organic pages driving traffic to a domain.
-            
-            Useful for detecting PSEO patterns and content strategies.
-            
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                database: Country database code (default 'us')
-                limit: Maximum number of pages to return (default 20, max 50)
-            
-            Returns:
-                Dictionary with top pages, their traffic, and keyword counts
-            """
-            try:
-                limit = min(limit, 50)
-                params = {
-                    "type": "domain_organic_organic",
-                    "key": semrush_api_key,
-                    "export_columns": "Dn,Ur,Ot,Or,Fk",
-                    "domain": domain,
-                    "database": database,
-                    "display_limit": limit,
-                }
-                logger.info(f"[SEMRUSH] Fetching organic pages for {domain} (limit: {limit})")
-                response = requests.get(BASE_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    if error_result.get("no_data"):
-                        return {
-                            "success": True,
-                            "domain": domain,
-                            "database": database,
-                            "pages": [],
-                            "total_pages": 0,
-                            "message": "No page data found",
-                            "pseo_analysis": {"detected": False, "patterns": []}
-                        }
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
+        if response.status_code != 200:
+            return _http_error(response, domain=domain)
+        
+        # Check for Semrush API errors (ERROR XX :: MESSAGE)
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            return error_result
+        
+        # Parse CSV response
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            logger.warning(f"[SEMRUSH] Unexpected response format for {domain}: {text[:200]}")
+            return {
+                "success": False,
+                "domain": domain,
+                "error": "Unexpected response format from Semrush API",
+            }
+        
+        data = dict(zip(headers, rows[0]))
+        
+        # Semrush API returns full column names in headers, not abbreviations
+        organic_traffic = data.get("Organic Traffic", data.get("Ot", "0")) or "0"
+        organic_keywords = data.get("Organic Keywords", data.get("Or", "0"))
+        
+        logger.info(f"[SEMRUSH] Successfully fetched data for {domain}: {organic_traffic} organic traffic")
+        
+        return {
+            "success": True,
+            "domain": domain,
+            "database": database,
+            "rank": data.get("Rank", data.get("Rk", "N/A")),
+            "organic_keywords": organic_keywords,
+            "organic_traffic": organic_traffic,
+            "organic_cost": data.get("Organic Cost", data.get("Oc", "0")),
+            "adwords_keywords": data.get("Adwords Keywords", data.get("Ad", "0")),
+            "adwords_traffic": data.get("Adwords Traffic", data.get("At", "0")),
+            "adwords_cost": data.get("Adwords Cost", data.get("Ac", "0")),
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 2: Organic Keywords
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_organic_keywords(
+    domain: str,
+    database: str = "us",
+    limit: int = 20,
+) -> dict:
+    """Get organic search keywords that a domain ranks for.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        database: Country database code (default 'us')
+        limit: Maximum number of keywords to return (default 20, max 100)
+    
+    Returns:
+        Dictionary with list of keywords, positions, search volumes
+    """
+    try:
+        limit = min(limit, 100)
+        params = {
+            "type": "domain_organic",
+            "key": _semrush_api_key,
+            "export_columns": "Ph,Po,Nq,Cp,Ur,Tr,Tc,Kd",
+            "domain": domain,
+            "database": database,
+            "display_limit": limit,
+            "display_sort": "tr_desc",  # Sort by traffic percentage (descending)
+        }
+        logger.info(f"[SEMRUSH] Fetching organic keywords for {domain} (limit: {limit})")
+        with _semrush_get(BASE_URL, params, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                return _http_error(response, domain=domain)
+            
+            # Semrush always answers in UTF-8; parse rows as they arrive
+            # instead of buffering the whole export
+            response.encoding = "utf-8"
+            lines = response.iter_lines(chunk_size=8192, decode_unicode=True)
+            first_line = (next(lines, None) or "").strip()
+            
+            # Check for Semrush API errors
+            error_result = _check_semrush_error(first_line, domain)
+            if error_result:
+                # If no data, return empty keywords list
+                if error_result.get("no_data"):
                     return {
                         "success": True,
                         "domain": domain,
                         "database": database,
-                        "pages": [],
-                        "total_pages": 0,
-                        "message": "No page data found",
-                        "pseo_analysis": {"detected": False, "patterns": []}
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                pages = []
-                url_patterns = {}
-                
-                for line in lines[1:]:
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]
-                    data = dict(zip(headers, values))
-                    url = data.get("Ur", "")
-                    
-                    pages.append({
-                        "url": url,
-                        "traffic": data.get("Ot", "0"),
-                        "keywords": data.get("Or", "0"),
-                        "first_keyword": data.get("Fk", ""),
-                    })
-                    
-                    # Detect URL patterns for PSEO
-                    if "/" in url:
-                        path_parts = url.split("/")
-                        if len(path_parts) >= 2:
-                            pattern = f"/{path_parts[1]}/*"
-                            url_patterns[pattern] = url_patterns.get(pattern, 0) + 1
-                
-                # Detect PSEO
-                pseo_detected = any(count >= 5 for count in url_patterns.values())
-                pseo_patterns = [pattern for pattern, count in url_patterns.items() if count >= 5]
-                
-                logger.info(f"[SEMRUSH] Found {len(pages)} pages for {domain}, PSEO detected: {pseo_detected}")
-                return {
-                    "success": True,
-                    "domain": domain,
-                    "database": database,
-                    "total_pages": len(pages),
-                    "pages": pages,
-                    "pseo_analysis": {
-                        "detected": pseo_detected,
-                        "patterns": pseo_patterns,
-                        "note": "PSEO = Programmatic SEO (many similar pages targeting long-tail keywords)"
+                        "keywords": [],
+                        "total_keywords": 0,
+                        "message": "No organic keywords found in Semrush database"
                     }
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching organic pages for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
-                }
+                return error_result
+            
+            headers, rows = _iter_semrush_csv(itertools.chain([first_line], lines))
+            slots = _column_slots(headers, ORGANIC_KEYWORD_COLUMNS)
+            keywords = [
+                {key: values[i] if 0 <= i < len(values) else default for key, i, default in slots}
+                for values in rows
+            ]
+        
+        if not keywords:
+            return {
+                "success": True,
+                "domain": domain,
+                "database": database,
+                "keywords": [],
+                "total_keywords": 0,
+                "message": "No organic keywords found",
+            }
+        
+        logger.info(f"[SEMRUSH] Found {len(keywords)} keywords for {domain}")
+        return {
+            "success": True,
+            "domain": domain,
+            "database": database,
+            "total_keywords": len(keywords),
+            "keywords": keywords,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching keywords for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 3: Backlinks Overview
+# ============================================================
+@_cached_tool(BACKLINKS_TTL)
+def semrush_backlinks_overview(
+    domain: str,
+) -> dict:
+    """Get backlink profile summary for a domain.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+    
+    Returns:
+        Dictionary with total backlinks, referring domains, authority score
+    """
+    try:
+        params = {
+            "type": "backlinks_overview",
+            "key": _semrush_api_key,
+            "target": domain,
+            "target_type": "root_domain",
+            "export_columns": "ascore,total,domains_num,urls_num,ips_num,follows_num,nofollows_num",
+        }
+        logger.info(f"[SEMRUSH] Fetching backlinks overview for {domain}")
+        response = _semrush_get(ANALYTICS_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            return _http_error(response, domain=domain)
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            return error_result
         
-        # ============================================================
-        # Tool 9: Backlink History (反链历史)
-        # ============================================================
-        def semrush_backlink_history(
-            domain: str,
-            months: int = 6,
-        ) -> dict:
-            """Get historical backlink profile changes over time.
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": "Unexpected response format from Semrush API",
+            }
+        
+        data = dict(zip(headers, rows[0]))
+        
+        logger.info(f"[SEMRUSH] Backlinks for {domain}: {data.get('total', '0')} total, {data.get('domains_num', '0')} domains")
+        return {
+            "success": True,
+            "domain": domain,
+            "authority_score": data.get("ascore", "0"),
+            "total_backlinks": data.get("total", "0"),
+            "referring_domains": data.get("domains_num", "0"),
+            "referring_urls": data.get("urls_num", "0"),
+            "referring_ips": data.get("ips_num", "0"),
+            "dofollow_links": data.get("follows_num", "0"),
+            "nofollow_links": data.get("nofollows_num", "0"),
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching backlinks for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 4: Backlinks List
+# ============================================================
+@_cached_tool(BACKLINKS_TTL)
+def semrush_backlinks_list(
+    domain: str,
+    limit: int = 20,
+) -> dict:
+    """Get list of individual backlinks pointing to a domain.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        limit: Maximum number of backlinks to return (default 20, max 100)
+    
+    Returns:
+        Dictionary with list of backlinks including source URL, anchor text
+    """
+    try:
+        limit = min(limit, 100)
+        params = {
+            "type": "backlinks",
+            "key": _semrush_api_key,
+            "target": domain,
+            "target_type": "root_domain",
+            "export_columns": "source_url,source_title,target_url,anchor,external_num,internal_num,first_seen,last_seen",
+            "display_limit": limit,
+        }
+        logger.info(f"[SEMRUSH] Fetching backlinks list for {domain} (limit: {limit})")
+        with _semrush_get(ANALYTICS_URL, params, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                return _http_error(response, domain=domain)
             
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
-                months: Number of months to retrieve (default 6, max 12)
+            # Semrush always answers in UTF-8; parse rows as they arrive
+            # instead of buffering the whole export
+            response.encoding = "utf-8"
+            lines = response.iter_lines(chunk_size=8192, decode_unicode=True)
+            first_line = (next(lines, None) or "").strip()
             
-            Returns:
-                Dictionary with monthly backlink counts and referring domain trends
-            """
-            try:
-                months = min(months, 12)
-                params = {
-                    "type": "backlinks_historical",
-                    "key": semrush_api_key,
-                    "target": domain,
-                    "target_type": "root_domain",
-                    "display_limit": months,
-                    "export_columns": "date,total,domains_num",
-                }
-                logger.info(f"[SEMRUSH] Fetching backlink history for {domain} ({months} months)")
-                response = requests.get(ANALYTICS_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
+            # Check for Semrush API errors
+            error_result = _check_semrush_error(first_line, domain)
+            if error_result:
+                if error_result.get("no_data"):
                     return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error: {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": False,
+                        "success": True,
                         "domain": domain,
-                        "error": "Unexpected response format from Semrush API",
+                        "backlinks": [],
+                        "total_returned": 0,
+                        "message": "No backlinks found"
                     }
-                
-                headers = [h.strip() for h in lines[0].split(";")]  # Strip whitespace
-                history = []
-                prev_domains = None
-                prev_backlinks = None
-                
-                for line in lines[1:]:
-                    if not line.strip():  # Skip empty lines
-                        continue
-                    values = [v.strip() for v in line.split(";")]  # Strip whitespace
-                    data = dict(zip(headers, values))
-                    
-                    total_backlinks = int(data.get("total", "0") or "0")
-                    referring_domains = int(data.get("domains_num", "0") or "0")
-                    
-                    # Calculate growth
-                    domain_growth = None
-                    backlink_growth = None
-                    if prev_domains is not None:
-                        domain_growth = referring_domains - prev_domains
-                        backlink_growth = total_backlinks - prev_backlinks
-                    
-                    history.append({
-                        "date": data.get("date", ""),
-                        "total_backlinks": total_backlinks,
-                        "referring_domains": referring_domains,
-                        "domain_growth": domain_growth,
-                        "backlink_growth": backlink_growth,
-                    })
-                    
-                    prev_domains = referring_domains
-                    prev_backlinks = total_backlinks
-                
-                logger.info(f"[SEMRUSH] Backlink history for {domain}: {len(history)} months analyzed")
+                return error_result
+            
+            headers, rows = _iter_semrush_csv(itertools.chain([first_line], lines))
+            slots = _column_slots(headers, BACKLINK_COLUMNS)
+            backlinks = [
+                {key: values[i] if 0 <= i < len(values) else default for key, i, default in slots}
+                for values in rows
+            ]
+        
+        if not backlinks:
+            return {
+                "success": True,
+                "domain": domain,
+                "backlinks": [],
+                "total_returned": 0,
+                "message": "No backlinks found",
+            }
+        
+        logger.info(f"[SEMRUSH] Found {len(backlinks)} backlinks for {domain}")
+        return {
+            "success": True,
+            "domain": domain,
+            "total_returned": len(backlinks),
+            "backlinks": backlinks,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching backlinks list for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 5: Keyword Gap Analysis
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_keyword_gap(
+    target_domain: str,
+    competitor_domain: str,
+    database: str = "us",
+    limit: int = 20,
+) -> dict:
+    """Compare keywords between two domains to find gap opportunities.
+    
+    Identifies keywords that the competitor ranks for but target domain does not.
+    
+    Args:
+        target_domain: Your domain (e.g., 'yoursite.com')
+        competitor_domain: Competitor domain (e.g., 'competitor.com')
+        database: Country database code (default 'us')
+        limit: Maximum number of gap keywords to return (default 20, max 100)
+    
+    Returns:
+        Dictionary with keywords that competitor has but you don't
+    """
+    try:
+        limit = min(limit, 100)
+        params = {
+            "type": "domain_domains",
+            "key": _semrush_api_key,
+            "domains": f"{target_domain}|{competitor_domain}",
+            "database": database,
+            "export_columns": "Dn,Cr,Np,Cp,Nq,Kd",
+            "display_limit": limit,
+            "display_filter": "+|Nq|Gt|100",  # Search volume > 100
+        }
+        logger.info(f"[SEMRUSH] Fetching keyword gap: {target_domain} vs {competitor_domain}")
+        response = _semrush_get(BASE_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            return _http_error(response, target_domain=target_domain, competitor_domain=competitor_domain)
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, f"{target_domain} vs {competitor_domain}")
+        if error_result:
+            if error_result.get("no_data"):
                 return {
                     "success": True,
-                    "domain": domain,
-                    "months_analyzed": len(history),
-                    "history": history,
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching backlink history for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
+                    "target_domain": target_domain,
+                    "competitor_domain": competitor_domain,
+                    "database": database,
+                    "gap_keywords": [],
+                    "total_gaps": 0,
+                    "message": "No keyword gaps found"
                 }
+            return {**error_result, "target_domain": target_domain, "competitor_domain": competitor_domain}
+        
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": True,
+                "target_domain": target_domain,
+                "competitor_domain": competitor_domain,
+                "database": database,
+                "gap_keywords": [],
+                "total_gaps": 0,
+                "message": "No keyword gaps found",
+            }
+        
+        domains = []
+        for values in rows:
+            data = dict(zip(headers, values))
+            domains.append({
+                "domain": data.get("Dn", ""),
+                "common_keywords": data.get("Cr", "0"),
+                "total_keywords": data.get("Np", "0"),
+                "avg_cpc": data.get("Cp", "0"),
+                "total_volume": data.get("Nq", "0"),
+                "avg_difficulty": data.get("Kd", "0"),
+            })
+        
+        logger.info(f"[SEMRUSH] Found {len(domains)} domain comparison results")
+        return {
+            "success": True,
+            "target_domain": target_domain,
+            "competitor_domain": competitor_domain,
+            "database": database,
+            "domains": domains,
+            "note": "To get specific gap keywords, use semrush_organic_keywords for each domain and compare manually"
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching keyword gap: {e}")
+        return {
+            "success": False,
+            "target_domain": target_domain,
+            "competitor_domain": competitor_domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 6: Domain Overview Batch (批量分析)
+# ============================================================
+def semrush_domain_overview_batch(
+    domains: list,
+    database: str = "us",
+) -> dict:
+    """Get SEO metrics for multiple domains at once.
+    
+    Args:
+        domains: List of domains to analyze (e.g., ['site1.com', 'site2.com'])
+        database: Country database code (default 'us')
+    
+    Returns:
+        Dictionary with results for each domain
+    """
+    try:
+        logger.info(f"[SEMRUSH] Batch analysis for {len(domains)} domains: {', '.join(domains)}")
+        results = []
+        success_count = 0
+        
+        # Each lookup is an independent blocking HTTP call; overlap them
+        # on a small worker pool (map keeps results in input order)
+        if domains:
+            with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(domains))) as executor:
+                results = list(executor.map(
+                    lambda domain: semrush_domain_overview(domain, database),
+                    domains,
+                ))
+        for result in results:
+            if result.get("success") and not result.get("no_data"):
+                success_count += 1
+        
+        logger.info(f"[SEMRUSH] Batch complete: {success_count}/{len(domains)} domains with data")
+        return {
+            "success": True,
+            "database": database,
+            "total_domains": len(domains),
+            "domains_with_data": success_count,
+            "results": results,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error in batch analysis: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 7: Domain History (历史流量趋势 - 关键工具!)
+# ============================================================
+@_cached_tool(HISTORY_TTL, stale_ttl=HISTORY_STALE_TTL)
+def semrush_domain_history(
+    domain: str,
+    database: str = "us",
+    months: int = 6,
+    include_top_pages: bool = False,
+) -> dict:
+    """Get historical traffic trends for a domain over time.
+    
+    This is a CRITICAL tool for detecting growth patterns and spikes.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        database: Country database code (default 'us')
+        months: Number of months to retrieve (default 6, max 12)
+        include_top_pages: When fluctuations are found, also fetch the top
+            organic pages (an extra paid API call) and attach them (default False)
+    
+    Returns:
+        Dictionary with monthly traffic data, keyword counts, and spike detection
+    """
+    try:
+        months = min(months, 12)
+        params = {
+            **DOMAIN_HISTORY_PARAMS,
+            "key": _semrush_api_key,
+            "domain": domain,
+            "database": database,
+            "display_limit": months,
+        }
+        
+        # 🔍 CRITICAL: Log the exact API request URL
+        api_url = BASE_URL + "?" + "&".join([f"{k}={v if k != 'key' else 'YOUR_API_KEY'}" for k, v in params.items()])
+        logger.info(f"[SEMRUSH] 🚀 CALLING domain_rank_history API")
+        logger.info(f"[SEMRUSH] 📋 Request Details:")
+        logger.info(f"  - Domain: {domain}")
+        logger.info(f"  - Database: {database}")
+        logger.info(f"  - Months: {months}")
+        logger.info(f"  - API URL: {api_url}")
         
-        # ============================================================
-        # Tool 10: Traffic Analytics
-        # ============================================================
-        def semrush_traffic_analytics(
-            domain: str,
-        ) -> dict:
-            """Get traffic analytics data for a domain.
+        response = _semrush_get(BASE_URL, params, timeout=30)
+        
+        # 🔍 Log response status and content preview
+        logger.info(f"[SEMRUSH] 📥 Response Status: {response.status_code}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[SEMRUSH] 📄 Response Preview (first 500 chars): %s",
+                response.content[:500].decode("utf-8", "replace"),
+            )
+        
+        if response.status_code != 200:
+            error_msg = _http_error_message(response)
+            logger.error(f"[SEMRUSH] ❌ API call failed: {error_msg}")
+            return {
+                "success": False,
+                "domain": domain,
+                "error": error_msg,
+                "api_url": api_url,
+            }
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            logger.warning(f"[SEMRUSH] ⚠️ API returned error: {error_result.get('error', 'Unknown')}")
+            error_result["api_url"] = api_url
+            return error_result
+        
+        headers, rows = _read_semrush_csv(text)
+        logger.info(f"[SEMRUSH] 📊 Response rows count: {len(rows)}")
+        
+        if not rows:
+            error_msg = "Unexpected response format from Semrush API (less than 2 lines)"
+            logger.error(f"[SEMRUSH] ❌ {error_msg}")
+            logger.error(f"[SEMRUSH] Full response: {text}")
+            return {
+                "success": False,
+                "domain": domain,
+                "error": error_msg,
+                "api_url": api_url,
+                "raw_response": text,
+            }
+        
+        logger.info(f"[SEMRUSH] 📑 Response headers: {headers}")
+        
+        # Resolve each field's column once, by full name or short code
+        index = {header: i for i, header in enumerate(headers)}
+        date_i, rank_i, keywords_i, traffic_i, cost_i = (
+            _column_index(index, name, DOMAIN_HISTORY_COLUMN_MAP[name])
+            for name in ("Date", "Rank", "Organic Keywords", "Organic Traffic", "Organic Cost")
+        )
+        
+        history = []
+        fluctuations = []
+        prev_traffic = None
+        
+        for line_idx, values in enumerate(rows, 1):
+            traffic = int(_cell(values, traffic_i, "0") or "0")
+            keywords = int(_cell(values, keywords_i, "0") or "0")
+            date_str = _cell(values, date_i, "")
             
-            Note: This endpoint requires Semrush Traffic Analytics subscription.
+            # 🔍 Log first 3 data rows for verification
+            if line_idx <= 3 and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[SEMRUSH] 📈 Data row %d: Date=%s, Traffic=%d, Keywords=%d",
+                    line_idx, date_str, traffic, keywords,
+                )
             
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
+            # Calculate MoM change
+            mom_change = None
+            mom_percent = None
+            if prev_traffic is not None and prev_traffic > 0:
+                mom_change = traffic - prev_traffic
+                mom_percent = round((mom_change / prev_traffic) * 100, 1)
             
-            Returns:
-                Dictionary with visits, unique visitors, pages per visit, bounce rate
-            """
-            try:
-                params = {
-                    "type": "traffic_summary",
-                    "key": semrush_api_key,
-                    "targets": domain,
-                    "export_columns": "target,visits,users,pages_per_visit,avg_visit_duration,bounce_rate",
-                    "display_date": "2024-01-01",  # Most recent month
+            history.append({
+                "date": date_str,
+                "rank": _cell(values, rank_i, "N/A"),
+                "organic_keywords": keywords,
+                "organic_traffic": traffic,
+                "organic_cost": _cell(values, cost_i, "0"),
+                "mom_change": mom_change,
+                "mom_percent": mom_percent,
+            })
+            
+            # Detect significant fluctuations in the same pass
+            if mom_percent is not None and abs(mom_percent) >= 15:
+                fluctuations.append({
+                    "month": date_str,
+                    "type": "spike" if mom_percent > 0 else "drop",
+                    "change_percent": mom_percent,
+                    "traffic_before": prev_traffic,
+                    "traffic_after": traffic,
+                })
+            
+            prev_traffic = traffic
+        
+        logger.info(f"[SEMRUSH] ✅ Successfully parsed {len(history)} months of data")
+        
+        # Determine if investigation is required
+        requires_investigation = len(fluctuations) > 0
+        organic_pages_preview = None
+        if (
+            requires_investigation
+            and include_top_pages
+            and get_enabled_tools().get("semrush_domain_organic_pages", True)
+        ):
+            # Every investigation starts with the top pages; the call is cached,
+            # so a later semrush_domain_organic_pages for the domain is free
+            pages = semrush_domain_organic_pages(domain, database)
+            if pages.get("success") and not pages.get("no_data"):
+                organic_pages_preview = {
+                    "pages": pages["pages"],
+                    "pseo_analysis": pages["pseo_analysis"],
                 }
-                logger.info(f"[SEMRUSH] Fetching traffic analytics for {domain} (requires premium subscription)")
-                response = requests.get(ANALYTICS_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    # Traffic Analytics often requires premium subscription
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error (may require premium subscription): {response.status_code} - {response.text[:200]}",
-                    }
-                
-                # Check for Semrush API errors
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    if error_result.get("no_data"):
-                        return {
-                            "success": False,
-                            "domain": domain,
-                            "error": "No traffic analytics data found (may require premium subscription)"
-                        }
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "No traffic data found (may require premium subscription)",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                values = [v.strip() for v in lines[1].split(";")]
-                data = dict(zip(headers, values))
-                
-                logger.info(f"[SEMRUSH] Traffic analytics for {domain}: {data.get('visits', 'N/A')} visits")
+        
+        investigation_tasks = []
+        if requires_investigation:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[SEMRUSH] 🔍 Detected %d significant fluctuations: %s",
+                    len(fluctuations),
+                    "; ".join(f"{fluc['month']}: {fluc['type']} ({fluc['change_percent']}%)" for fluc in fluctuations),
+                )
+            if organic_pages_preview is not None:
+                pages_action = "Review organic_pages_preview to find page changes"
+            else:
+                pages_action = f"Call semrush_domain_organic_pages({domain}) to find page changes"
+            for fluc in fluctuations:
+                investigation_tasks.append({
+                    "month": fluc["month"],
+                    "type": fluc["type"],
+                    "actions": [
+                        pages_action,
+                        f"Call web_search('{domain} {fluc['month'][:7]} launch update') to find news",
+                        f"Call web_search('Google algorithm update {fluc['month'][:7]}') to check algorithm changes",
+                    ]
+                })
+        else:
+            logger.info(f"[SEMRUSH] ✓ No significant fluctuations detected (all <15% MoM)")
+        
+        fluctuation_investigation = {
+            "requires_investigation": requires_investigation,
+            "detected_fluctuations": fluctuations,
+            "investigation_tasks": investigation_tasks,
+        }
+        if organic_pages_preview is not None:
+            fluctuation_investigation["organic_pages_preview"] = organic_pages_preview
+        
+        result = {
+            "success": True,
+            "domain": domain,
+            "database": database,
+            "months_analyzed": len(history),
+            "history": history,
+            "fluctuation_investigation": fluctuation_investigation,
+            "api_url": api_url,
+        }
+        
+        logger.info(f"[SEMRUSH] 🎉 domain_rank_history completed successfully for {domain}")
+        logger.info(f"[SEMRUSH] Summary: {len(history)} months, {len(fluctuations)} fluctuations")
+        return result
+        
+    except Exception as e:
+        error_msg = str(e)
+        # The full stack trace is only formatted when debug logging is on
+        logger.error(
+            "[SEMRUSH] ❌ Exception in domain_history for %s: %s", domain, error_msg,
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
+        return {
+            "success": False,
+            "domain": domain,
+            "error": error_msg,
+        }
+
+
+# ============================================================
+# Tool 8: Domain Organic Pages (页面分析)
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_domain_organic_pages(
+    domain: str,
+    database: str = "us",
+    limit: int = 20,
+) -> dict:
+    """Get top organic pages driving traffic to a domain.
+    
+    Useful for detecting PSEO patterns and content strategies.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        database: Country database code (default 'us')
+        limit: Maximum number of pages to return (default 20, max 50)
+    
+    Returns:
+        Dictionary with top pages, their traffic, and keyword counts
+    """
+    try:
+        limit = min(limit, 50)
+        params = {
+            "type": "domain_organic_organic",
+            "key": _semrush_api_key,
+            "export_columns": "Dn,Ur,Ot,Or,Fk",
+            "domain": domain,
+            "database": database,
+            "display_limit": limit,
+        }
+        logger.info(f"[SEMRUSH] Fetching organic pages for {domain} (limit: {limit})")
+        response = _semrush_get(BASE_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            return _http_error(response, domain=domain)
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            if error_result.get("no_data"):
                 return {
                     "success": True,
                     "domain": domain,
-                    "monthly_visits": data.get("visits", "N/A"),
-                    "unique_visitors": data.get("users", "N/A"),
-                    "pages_per_visit": data.get("pages_per_visit", "N/A"),
-                    "avg_visit_duration": data.get("avg_visit_duration", "N/A"),
-                    "bounce_rate": data.get("bounce_rate", "N/A"),
-                }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching traffic analytics for {domain}: {e}")
-                return {
-                    "success": False,
-                    "domain": domain,
-                    "error": str(e),
+                    "database": database,
+                    "pages": [],
+                    "total_pages": 0,
+                    "message": "No page data found",
+                    "pseo_analysis": {"detected": False, "patterns": []}
                 }
+            return error_result
+        
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": True,
+                "domain": domain,
+                "database": database,
+                "pages": [],
+                "total_pages": 0,
+                "message": "No page data found",
+                "pseo_analysis": {"detected": False, "patterns": []}
+            }
         
-        # ============================================================
-        # Tool 11: Traffic Sources Distribution
-        # ============================================================
-        def semrush_traffic_sources(
-            domain: str,
-        ) -> dict:
-            """Get traffic sources breakdown for a domain (organic, direct, referral, social).
+        slots = _column_slots(headers, ORGANIC_PAGE_COLUMNS)
+        pages = []
+        url_patterns = Counter()
+        
+        for values in rows:
+            page = {key: values[i] if 0 <= i < len(values) else default for key, i, default in slots}
+            pages.append(page)
+            url = page["url"]
             
-            Note: This endpoint requires Semrush Traffic Analytics subscription.
+            # Detect URL patterns for PSEO
+            pattern = _url_section_pattern(url)
+            if pattern is not None:
+                url_patterns[pattern] += 1
+        
+        # Detect PSEO
+        pseo_patterns = [pattern for pattern, count in url_patterns.items() if count >= 5]
+        pseo_detected = bool(pseo_patterns)
+        
+        logger.info(f"[SEMRUSH] Found {len(pages)} pages for {domain}, PSEO detected: {pseo_detected}")
+        return {
+            "success": True,
+            "domain": domain,
+            "database": database,
+            "total_pages": len(pages),
+            "pages": pages,
+            "pseo_analysis": {
+                "detected": pseo_detected,
+                "patterns": pseo_patterns,
+                "note": "PSEO = Programmatic SEO (many similar pages targeting long-tail keywords)"
+            }
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching organic pages for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 9: Backlink History (反链历史)
+# ============================================================
+@_cached_tool(HISTORY_TTL)
+def semrush_backlink_history(
+    domain: str,
+    months: int = 6,
+) -> dict:
+    """Get historical backlink profile changes over time.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        months: Number of months to retrieve (default 6, max 12)
+    
+    Returns:
+        Dictionary with monthly backlink counts and referring domain trends
+    """
+    try:
+        months = min(months, 12)
+        params = {
+            "type": "backlinks_historical",
+            "key": _semrush_api_key,
+            "target": domain,
+            "target_type": "root_domain",
+            "display_limit": months,
+            "export_columns": "date,total,domains_num",
+        }
+        logger.info(f"[SEMRUSH] Fetching backlink history for {domain} ({months} months)")
+        response = _semrush_get(ANALYTICS_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            return _http_error(response, domain=domain)
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            return error_result
+        
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": "Unexpected response format from Semrush API",
+            }
+        
+        index = {header: i for i, header in enumerate(headers)}
+        date_i = _column_index(index, "date")
+        total_i = _column_index(index, "total")
+        domains_i = _column_index(index, "domains_num")
+        
+        history = []
+        prev_domains = None
+        prev_backlinks = None
+        
+        for values in rows:
+            total_backlinks = int(_cell(values, total_i, "0") or "0")
+            referring_domains = int(_cell(values, domains_i, "0") or "0")
             
-            Args:
-                domain: The domain to analyze (e.g., 'example.com')
+            # Calculate growth
+            domain_growth = None
+            backlink_growth = None
+            if prev_domains is not None:
+                domain_growth = referring_domains - prev_domains
+                backlink_growth = total_backlinks - prev_backlinks
             
-            Returns:
-                Dictionary with traffic source percentages:
-                - organic: SEO traffic from search engines
-                - direct: Direct visits (typing URL)
-                - referral: Referral traffic from other sites
-                - social: Traffic from social media platforms
-            """
-            try:
-                params = {
-                    "type": "traffic_sources",
-                    "key": semrush_api_key,
-                    "targets": domain,
-                    "export_columns": "target,organic,direct,referral,social",
-                }
-                logger.info(f"[SEMRUSH] Fetching traffic sources for {domain}")
-                response = requests.get(ANALYTICS_URL, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": f"HTTP error (may require premium subscription): {response.status_code}",
-                    }
-                
-                text = response.text.strip()
-                error_result = check_semrush_error(text, domain)
-                if error_result:
-                    if error_result.get("no_data"):
-                        return {
-                            "success": False,
-                            "domain": domain,
-                            "error": "No traffic sources data found (may require premium subscription)"
-                        }
-                    return error_result
-                
-                lines = text.split("\n")
-                if len(lines) < 2:
-                    return {
-                        "success": False,
-                        "domain": domain,
-                        "error": "No traffic sources data found (may require premium subscription)",
-                    }
-                
-                headers = [h.strip() for h in lines[0].split(";")]
-                values = [v.strip() for v in lines[1].split(";")]
-                data = dict(zip(headers, values))
-                
-                # Convert to percentages
-                organic = float(data.get("organic", 0)) * 100
-                direct = float(data.get("direct", 0)) * 100
-                referral = float(data.get("referral", 0)) * 100
-                social = float(data.get("social", 0)) * 100
-                
-                logger.info(f"[SEMRUSH] Traffic sources for {domain}: organic={organic:.1f}%, direct={direct:.1f}%, referral={referral:.1f}%, social={social:.1f}%")
+            history.append({
+                "date": _cell(values, date_i, ""),
+                "total_backlinks": total_backlinks,
+                "referring_domains": referring_domains,
+                "domain_growth": domain_growth,
+                "backlink_growth": backlink_growth,
+            })
+            
+            prev_domains = referring_domains
+            prev_backlinks = total_backlinks
+        
+        logger.info(f"[SEMRUSH] Backlink history for {domain}: {len(history)} months analyzed")
+        return {
+            "success": True,
+            "domain": domain,
+            "months_analyzed": len(history),
+            "history": history,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching backlink history for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 10: Traffic Analytics
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_traffic_analytics(
+    domain: str,
+) -> dict:
+    """Get traffic analytics data for a domain.
+    
+    Note: This endpoint requires Semrush Traffic Analytics subscription.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+    
+    Returns:
+        Dictionary with visits, unique visitors, pages per visit, bounce rate
+    """
+    try:
+        params = {
+            "type": "traffic_summary",
+            "key": _semrush_api_key,
+            "targets": domain,
+            "export_columns": "target,visits,users,pages_per_visit,avg_visit_duration,bounce_rate",
+            "display_date": "2024-01-01",  # Most recent month
+        }
+        logger.info(f"[SEMRUSH] Fetching traffic analytics for {domain} (requires premium subscription)")
+        response = _semrush_get(ANALYTICS_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            # Traffic Analytics often requires premium subscription
+            return _http_error(response, "HTTP error (may require premium subscription)", domain=domain)
+        
+        # Check for Semrush API errors
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            if error_result.get("no_data"):
                 return {
-                    "success": True,
+                    "success": False,
                     "domain": domain,
-                    "traffic_sources": {
-                        "organic": round(organic, 1),
-                        "direct": round(direct, 1),
-                        "referral": round(referral, 1),
-                        "social": round(social, 1),
-                    },
-                    "seo_ratio": round(organic, 1),
-                    "non_seo_ratio": round(100 - organic, 1),
-                    "analysis": {
-                        "primary_channel": max(
-                            [("organic", organic), ("direct", direct), ("referral", referral), ("social", social)],
-                            key=lambda x: x[1]
-                        )[0],
-                        "seo_dominant": organic >= 50,
-                    }
+                    "error": "No traffic analytics data found (may require premium subscription)"
                 }
-            except Exception as e:
-                logger.error(f"[SEMRUSH] Error fetching traffic sources for {domain}: {e}")
+            return error_result
+        
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": "No traffic data found (may require premium subscription)",
+            }
+        
+        data = dict(zip(headers, rows[0]))
+        
+        logger.info(f"[SEMRUSH] Traffic analytics for {domain}: {data.get('visits', 'N/A')} visits")
+        return {
+            "success": True,
+            "domain": domain,
+            "monthly_visits": data.get("visits", "N/A"),
+            "unique_visitors": data.get("users", "N/A"),
+            "pages_per_visit": data.get("pages_per_visit", "N/A"),
+            "avg_visit_duration": data.get("avg_visit_duration", "N/A"),
+            "bounce_rate": data.get("bounce_rate", "N/A"),
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching traffic analytics for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 11: Traffic Sources Distribution
+# ============================================================
+@_cached_tool(OVERVIEW_TTL)
+def semrush_traffic_sources(
+    domain: str,
+) -> dict:
+    """Get traffic sources breakdown for a domain (organic, direct, referral, social).
+    
+    Note: This endpoint requires Semrush Traffic Analytics subscription.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+    
+    Returns:
+        Dictionary with traffic source percentages:
+        - organic: SEO traffic from search engines
+        - direct: Direct visits (typing URL)
+        - referral: Referral traffic from other sites
+        - social: Traffic from social media platforms
+    """
+    try:
+        params = {
+            "type": "traffic_sources",
+            "key": _semrush_api_key,
+            "targets": domain,
+            "export_columns": "target,organic,direct,referral,social",
+        }
+        logger.info(f"[SEMRUSH] Fetching traffic sources for {domain}")
+        response = _semrush_get(ANALYTICS_URL, params, timeout=30)
+        
+        if response.status_code != 200:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": f"HTTP error (may require premium subscription): {response.status_code}",
+            }
+        
+        text = response.content.decode("utf-8", "replace")
+        error_result = _check_semrush_error(text, domain)
+        if error_result:
+            if error_result.get("no_data"):
                 return {
                     "success": False,
                     "domain": domain,
-                    "error": str(e),
+                    "error": "No traffic sources data found (may require premium subscription)"
                 }
+            return error_result
+        
+        headers, rows = _read_semrush_csv(text)
+        if not rows:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": "No traffic sources data found (may require premium subscription)",
+            }
+        
+        data = dict(zip(headers, rows[0]))
+        
+        # Convert every channel share to a percentage in one pass
+        shares = {channel: float(data.get(channel, 0)) * 100 for channel in TRAFFIC_SOURCE_CHANNELS}
+        organic = shares["organic"]
+        
+        logger.info(f"[SEMRUSH] Traffic sources for {domain}: " + ", ".join(f"{channel}={share:.1f}%" for channel, share in shares.items()))
+        return {
+            "success": True,
+            "domain": domain,
+            "traffic_sources": {channel: round(share, 1) for channel, share in shares.items()},
+            "seo_ratio": round(organic, 1),
+            "non_seo_ratio": round(100 - organic, 1),
+            "analysis": {
+                "primary_channel": max(shares, key=shares.get),
+                "seo_dominant": organic >= 50,
+            }
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching traffic sources for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 12: Domain History Batch (批量历史趋势)
+# ============================================================
+def semrush_domain_history_batch(
+    domains: list,
+    database: str = "us",
+    months: int = 6,
+) -> dict:
+    """Get historical traffic trends for multiple domains at once.
+    
+    Runs semrush_domain_history for every domain concurrently, so comparing
+    the growth of a whole competitor set costs about one round-trip.
+    
+    Args:
+        domains: List of domains to analyze (e.g., ['site1.com', 'site2.com'])
+        database: Country database code (default 'us')
+        months: Number of months to retrieve per domain (default 6, max 12)
+    
+    Returns:
+        Dictionary with the domain history result for each domain, in input order
+    """
+    try:
+        logger.info(f"[SEMRUSH] Batch history for {len(domains)} domains ({months} months): {', '.join(domains)}")
+        results = []
+        
+        if domains:
+            with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(domains))) as executor:
+                results = list(executor.map(
+                    lambda domain: semrush_domain_history(domain, database, months),
+                    domains,
+                ))
+        success_count = sum(
+            1 for result in results
+            if result.get("success") and not result.get("no_data")
+        )
+        
+        logger.info(f"[SEMRUSH] Batch history complete: {success_count}/{len(domains)} domains with data")
+        return {
+            "success": True,
+            "database": database,
+            "total_domains": len(domains),
+            "domains_with_data": success_count,
+            "results": results,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error in batch history: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+        }
+
+
+# ============================================================
+# Tool 13: Domain Report (并行多维分析)
+# ============================================================
+def semrush_domain_report(
+    domain: str,
+    database: str = "us",
+    months: int = 6,
+    pages_limit: int = 20,
+    sections: list[str] | None = None,
+) -> dict:
+    """Get the Semrush picture of one domain in a single call.
+    
+    Fetches the requested sections concurrently, so the wait is one
+    round-trip rather than one per section. Use this for "analyze this
+    domain" requests instead of calling the single-report tools one after
+    another; e.g. sections=["overview", "history"] for a quick snapshot of
+    current metrics and traffic trends.
+    
+    Args:
+        domain: The domain to analyze (e.g., 'example.com')
+        database: Country database code (default 'us')
+        months: Number of months of history to retrieve (default 6, max 12)
+        pages_limit: Maximum number of top pages to return (default 20, max 50)
+        sections: Sections to fetch, any of "overview", "history",
+            "organic_pages" and "backlinks" (default: all four)
+    
+    Returns:
+        Dictionary with one result per requested section, keyed by section name
+    """
+    try:
+        requested = list(DOMAIN_REPORT_SECTIONS) if not sections else list(dict.fromkeys(sections))
+        unknown = [name for name in requested if name not in DOMAIN_REPORT_SECTIONS]
+        if unknown:
+            return {
+                "success": False,
+                "domain": domain,
+                "error": f"Unknown report sections: {', '.join(unknown)} (choose from {', '.join(DOMAIN_REPORT_SECTIONS)})",
+            }
+        
+        fetchers = {
+            "overview": lambda: semrush_domain_overview(domain, database),
+            "history": lambda: semrush_domain_history(domain, database, months),
+            "organic_pages": lambda: semrush_domain_organic_pages(domain, database, pages_limit),
+            "backlinks": lambda: semrush_backlinks_overview(domain),
+        }
+        
+        logger.info(f"[SEMRUSH] Fetching domain report for {domain} (database: {database}, sections: {', '.join(requested)})")
+        # Every section goes through its cached tool, so later single-report
+        # calls for the same domain are cache hits
+        with ThreadPoolExecutor(max_workers=len(requested)) as executor:
+            futures = {name: executor.submit(fetchers[name]) for name in requested}
+            results = {name: future.result() for name, future in futures.items()}
+        
+        return {
+            "success": any(section.get("success") for section in results.values()),
+            "domain": domain,
+            "database": database,
+            **results,
+        }
+    except Exception as e:
+        logger.error(f"[SEMRUSH] Error fetching domain report for {domain}: {e}")
+        return {
+            "success": False,
+            "domain": domain,
+            "error": str(e),
+        }
+
+
+# Registration order of the tools returned by get_semrush_tools; each one
+# can be switched off through its name in enabled_tools
+_SEMRUSH_TOOL_REGISTRY = (
+    ("semrush_domain_overview", semrush_domain_overview),
+    ("semrush_domain_overview_batch", semrush_domain_overview_batch),
+    ("semrush_domain_history", semrush_domain_history),
+    ("semrush_domain_history_batch", semrush_domain_history_batch),
+    ("semrush_domain_report", semrush_domain_report),
+    ("semrush_domain_organic_pages", semrush_domain_organic_pages),
+    ("semrush_organic_keywords", semrush_organic_keywords),
+    ("semrush_backlinks_overview", semrush_backlinks_overview),
+    ("semrush_backlink_history", semrush_backlink_history),
+    ("semrush_backlinks_list", semrush_backlinks_list),
+    ("semrush_keyword_gap", semrush_keyword_gap),
+    ("semrush_traffic_analytics", semrush_traffic_analytics),
+    ("semrush_traffic_sources", semrush_traffic_sources),
+)
+
+
+def get_semrush_tools() -> list:
+    """Get Semrush API tools if API key is configured.
+    
+    Returns:
+        List of tools if Semrush is configured, empty list otherwise.
+        
+    Available tools:
+        - semrush_domain_overview: Get overall SEO metrics for a domain
+        - semrush_domain_overview_batch: Batch analyze multiple domains at once
+        - semrush_domain_history: Get 6-12 month traffic trends (KEY for growth analysis!)
+        - semrush_domain_history_batch: Traffic trends for multiple domains at once
+        - semrush_domain_report: Overview, history, top pages and/or backlinks for one domain, fetched concurrently
+        - semrush_domain_organic_pages: Get top traffic-driving pages (PSEO detection)
+        - semrush_organic_keywords: Get organic search keywords for a domain
+        - semrush_backlinks_overview: Get backlink profile summary
+        - semrush_backlink_history: Get backlink trend over time
+        - semrush_backlinks_list: Get list of individual backlinks
+        - semrush_keyword_gap: Compare keywords between two domains
+        - semrush_traffic_analytics: Get traffic analytics data
+    """
+    semrush_api_key = _resolve_api_key()
+    
+    if not semrush_api_key:
+        logger.info("[SEMRUSH] No Semrush API key configured, SEO tools disabled")
+        return []
+    
+    if requests is None:
+        logger.error("[SEMRUSH] requests is not installed, SEO tools disabled")
+        return []
+    
+    global _semrush_api_key, _session
+    _semrush_api_key = semrush_api_key
+    
+    try:
+        if _session is None:
+            # Retry 429/5xx with exponential backoff (honouring Retry-After);
+            # the last response is returned rather than raised so the tools
+            # still report it as an HTTP error
+            retries = Retry(
+                total=3,
+                backoff_factor=0.4,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            # Both endpoints live on api.semrush.com, so one pooled session keeps
+            # the TLS connection alive across calls (and across batch workers)
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries))
         
         # Filter tools based on enabled_tools config
         enabled = get_enabled_tools()
         tools = []
         tool_names = []
-        
-        if enabled.get("semrush_domain_overview", True):
-            tools.append(semrush_domain_overview)
-            tool_names.append("semrush_domain_overview")
-        if enabled.get("semrush_domain_overview_batch", True):
-            tools.append(semrush_domain_overview_batch)
-            tool_names.append("semrush_domain_overview_batch")
-        if enabled.get("semrush_domain_history", True):
-            tools.append(semrush_domain_history)
-            tool_names.append("semrush_domain_history")
-        if enabled.get("semrush_domain_organic_pages", True):
-            tools.append(semrush_domain_organic_pages)
-            tool_names.append("semrush_domain_organic_pages")
-        if enabled.get("semrush_organic_keywords", True):
-            tools.append(semrush_organic_keywords)
-            tool_names.append("semrush_organic_keywords")
-        if enabled.get("semrush_backlinks_overview", True):
-            tools.append(semrush_backlinks_overview)
-            tool_names.append("semrush_backlinks_overview")
-        if enabled.get("semrush_backlink_history", True):
-            tools.append(semrush_backlink_history)
-            tool_names.append("semrush_backlink_history")
-        if enabled.get("semrush_backlinks_list", True):
-            tools.append(semrush_backlinks_list)
-            tool_names.append("semrush_backlinks_list")
-        if enabled.get("semrush_keyword_gap", True):
-            tools.append(semrush_keyword_gap)
-            tool_names.append("semrush_keyword_gap")
-        if enabled.get("semrush_traffic_analytics", True):
-            tools.append(semrush_traffic_analytics)
-            tool_names.append("semrush_traffic_analytics")
-        if enabled.get("semrush_traffic_sources", True):
-            tools.append(semrush_traffic_sources)
-            tool_names.append("semrush_traffic_sources")
+        for name, tool in _SEMRUSH_TOOL_REGISTRY:
+            if enabled.get(name, True):
+                tools.append(tool)
+                tool_names.append(name)
         
         if tools:
             logger.info(f"[SEMRUSH] Tools enabled: {', '.join(tool_names)}")
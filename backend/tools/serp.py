@@ -3,6 +3,11 @@
 import logging
 import os
 
+try:
+    import orjson
+except ImportError:  # optional: faster parsing of large SerpAPI payloads
+    orjson = None
+
 from .config import load_config_file, get_enabled_tools
 
 logger = logging.getLogger(__name__)
@@ -29,15 +34,30 @@ def get_serp_tools() -> list:
     
     try:
         import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
         
         BASE_URL = "https://serpapi.com/search"
         
+        # Keep-alive session so repeated searches reuse the TLS connection;
+        # transient 429/5xx responses are retried with exponential backoff
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+        
         def _serp_request(params: dict) -> dict:
             """Helper function to make SerpAPI requests."""
             try:
                 params["api_key"] = serp_api_key
-                response = requests.get(BASE_URL, params=params, timeout=60)
+                response = session.get(BASE_URL, params=params, timeout=60)
                 response.raise_for_status()
+                if orjson is not None:
+                    return orjson.loads(response.content)
                 return response.json()
             except requests.exceptions.RequestException as e:
                 return {"error": str(e)}
@@ -1,12 +1,26 @@
 """Serper Google Search tools."""
 
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+except ImportError:  # optional: faster (de)serialisation of search payloads
+    orjson = None
+
+from .cache import cache_successful_results
 from .config import load_config_file, get_enabled_tools
 
 logger = logging.getLogger(__name__)
 
+# Concurrent searches issued by serper_batch_search
+BATCH_MAX_WORKERS = 8
+# Agents often repeat a search while reasoning; identical searches within
+# this window are answered from memory
+SEARCH_CACHE_TTL = 5 * 60
+
 
 def get_serper_tools() -> list:
     """Get Serper API tools if API key is configured.
@@ -18,6 +32,7 @@ def get_serper_tools() -> list:
         
     Available tools:
         - serper_google_search: Perform Google searches
+        - serper_batch_search: Several Google searches run concurrently
     """
     config = load_config_file()
     serper_api_key = config.get("serper_api_key") if config else None
@@ -31,7 +46,30 @@ def get_serper_tools() -> list:
     
     try:
         import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Keep-alive session so repeated (and batched) searches reuse pooled
+        # TLS connections to google.serper.dev instead of a new handshake each.
+        # Searches are idempotent, so transient 429/5xx responses are retried
+        # with backoff; the last response is returned rather than raised so it
+        # is still reported as an API error
+        retries = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=BATCH_MAX_WORKERS, max_retries=retries))
+        session.headers.update({
+            "X-API-KEY": serper_api_key,
+            "Content-Type": "application/json",
+        })
         
+        @cache_successful_results(SEARCH_CACHE_TTL)
         def serper_google_search(
             query: str,
             num_results: int = 10,
@@ -54,10 +92,6 @@ def get_serper_tools() -> list:
             try:
                 num_results = min(num_results, 100)
                 
-                headers = {
-                    "X-API-KEY": serper_api_key,
-                    "Content-Type": "application/json",
-                }
                 payload = {
                     "q": query,
                     "num": num_results,
@@ -65,31 +99,40 @@ def get_serper_tools() -> list:
                     "hl": language,
                 }
                 
-                response = requests.post(
+                # Content-Type is set on the session; requests derives the
+                # Content-Length from the pre-serialised body
+                response = session.post(
                     "https://google.serper.dev/search",
-                    headers=headers,
-                    json=payload,
+                    data=orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode(),
                     timeout=30,
                 )
                 
                 if response.status_code != 200:
+                    # Rate limits and server errors (already retried by the
+                    # adapter) only need their status; client errors quote the
+                    # start of the body without decoding all of it
+                    if response.status_code == 429 or response.status_code >= 500:
+                        detail = response.reason
+                    else:
+                        detail = response.content[:200].decode("utf-8", "replace")
                     return {
                         "success": False,
                         "query": query,
-                        "error": f"API error: {response.status_code} - {response.text[:200]}",
+                        "error": f"API error: {response.status_code} - {detail}",
                     }
                 
-                data = response.json()
+                data = orjson.loads(response.content) if orjson is not None else response.json()
                 
                 # Extract organic results
-                organic = []
-                for result in data.get("organic", []):
-                    organic.append({
+                organic = [
+                    {
                         "title": result.get("title", ""),
                         "link": result.get("link", ""),
                         "snippet": result.get("snippet", ""),
                         "position": result.get("position", 0),
-                    })
+                    }
+                    for result in data.get("organic", [])
+                ]
                 
                 # Extract knowledge graph if present
                 knowledge_graph = data.get("knowledgeGraph", {})
@@ -119,6 +162,37 @@ def get_serper_tools() -> list:
                     "error": str(e),
                 }
         
+        def serper_batch_search(
+            queries: list[str],
+            num_results: int = 10,
+            country: str = "us",
+            language: str = "en",
+        ) -> list[dict]:
+            """Run several independent Google searches concurrently.
+            
+            Use this instead of repeated serper_google_search calls when you
+            need results for multiple unrelated queries at once.
+            
+            Args:
+                queries: List of search query strings
+                num_results: Number of results to return per query (default 10, max 100)
+                country: Country code for localized results (default 'us')
+                language: Language code (default 'en')
+            
+            Returns:
+                List of search results, one per query and in the same order
+            """
+            if not queries:
+                return []
+            
+            # serper_google_search never raises, so each slot holds its own
+            # success or error result
+            with ThreadPoolExecutor(max_workers=min(len(queries), BATCH_MAX_WORKERS)) as executor:
+                return list(executor.map(
+                    lambda query: serper_google_search(query, num_results, country, language),
+                    queries,
+                ))
+        
         # Filter tools based on enabled_tools config
         enabled = get_enabled_tools()
         tools = []
@@ -127,6 +201,9 @@ def get_serper_tools() -> list:
         if enabled.get("serper_google_search", True):
             tools.append(serper_google_search)
             tool_names.append("serper_google_search")
+        if enabled.get("serper_batch_search", True):
+            tools.append(serper_batch_search)
+            tool_names.append("serper_batch_search")
         
         if tools:
             logger.info(f"[SERPER] Tools enabled: {', '.join(tool_names)}")
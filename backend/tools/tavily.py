@@ -2,11 +2,31 @@
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    from tavily import TavilyClient
+except ImportError:  # Tavily tools are disabled without tavily-python
+    TavilyClient = None
+
+from .cache import cache_successful_results
 from .config import load_config_file, get_enabled_tools
 
 logger = logging.getLogger(__name__)
 
+# Agents often repeat a search while reasoning; identical searches within
+# this window are answered from memory
+SEARCH_CACHE_TTL = 5 * 60
+
+# Tavily /extract accepts at most 20 URLs per request; longer lists are
+# split into chunks that are extracted concurrently
+EXTRACT_CHUNK_SIZE = 20
+EXTRACT_MAX_URLS = 100
+EXTRACT_MAX_WORKERS = 5
+
+# (api_key, client) reused across get_tavily_tools() calls until the key changes
+_client_cache: tuple[str, "TavilyClient"] | None = None
+
 
 def get_tavily_tools() -> list:
     """Get Tavily API tools if API key is configured.
@@ -33,11 +53,19 @@ def get_tavily_tools() -> list:
     # Set environment variable for any libraries that need it
     os.environ["TAVILY_API_KEY"] = tavily_api_key
     
+    if TavilyClient is None:
+        logger.warning("[TAVILY] Required packages not installed: tavily")
+        logger.warning("[TAVILY] Run: pip install tavily-python")
+        return []
+    
+    global _client_cache
+    
     try:
-        from tavily import TavilyClient
-        
-        tavily_client = TavilyClient(api_key=tavily_api_key)
+        if _client_cache is None or _client_cache[0] != tavily_api_key:
+            _client_cache = (tavily_api_key, TavilyClient(api_key=tavily_api_key))
+        tavily_client = _client_cache[1]
         
+        @cache_successful_results(SEARCH_CACHE_TTL)
         def tavily_search(
             query: str,
             max_results: int = 5,
@@ -58,13 +86,14 @@ def get_tavily_tools() -> list:
                     include_raw_content=False,
                 )
                 
-                results = []
-                for result in response.get("results", []):
-                    results.append({
+                results = [
+                    {
                         "title": result.get("title", ""),
                         "url": result.get("url", ""),
                         "content": result.get("content", ""),
-                    })
+                    }
+                    for result in response.get("results", [])
+                ]
                 
                 return {
                     "success": True,
@@ -87,37 +116,59 @@ def get_tavily_tools() -> list:
             """Extract content from URLs using Tavily /extract endpoint.
             
             Handles JavaScript-rendered pages and complex layouts.
-            Can extract from single URL or multiple URLs (max 20).
+            Can extract from a single URL or many URLs (max 100); lists longer
+            than 20 URLs are fetched as concurrent batches.
             
             Args:
-                urls: List of URLs to extract content from (max 20)
+                urls: List of URLs to extract content from (max 100)
                 include_images: Whether to include extracted images (default False)
             
             Returns:
                 Dictionary containing extracted content from each URL
             """
-            try:
-                urls = urls[:20]
-                
+            def _extract_chunk(chunk: list[str]) -> list[dict]:
                 response = tavily_client.extract(
-                    urls=urls,
+                    urls=chunk,
                     include_images=include_images,
                 )
-                
-                results = []
-                for result in response.get("results", []):
-                    results.append({
+                return [
+                    {
                         "url": result.get("url", ""),
                         "content": result.get("raw_content", "")[:30000],
                         "images": result.get("images", []) if include_images else [],
-                    })
+                    }
+                    for result in response.get("results", [])
+                ]
+            
+            try:
+                urls = urls[:EXTRACT_MAX_URLS]
+                chunks = [urls[i:i + EXTRACT_CHUNK_SIZE] for i in range(0, len(urls), EXTRACT_CHUNK_SIZE)]
                 
-                return {
+                errors = []
+                if len(chunks) <= 1:
+                    results = _extract_chunk(urls)
+                else:
+                    results = []
+                    with ThreadPoolExecutor(max_workers=min(len(chunks), EXTRACT_MAX_WORKERS)) as executor:
+                        futures = [executor.submit(_extract_chunk, chunk) for chunk in chunks]
+                        # Keep the input order; a failed batch only loses its own URLs
+                        for future in futures:
+                            try:
+                                results.extend(future.result())
+                            except Exception as e:
+                                errors.append(str(e))
+                    if len(errors) == len(chunks):
+                        raise RuntimeError(errors[0])
+                
+                result = {
                     "success": True,
                     "urls_requested": len(urls),
                     "urls_extracted": len(results),
                     "results": results,
                 }
+                if errors:
+                    result["errors"] = errors
+                return result
             except Exception as e:
                 return {
                     "success": False,
@@ -198,13 +249,14 @@ def get_tavily_tools() -> list:
                 
                 response = tavily_client.crawl(**crawl_params)
                 
-                results = []
-                for result in response.get("results", []):
-                    results.append({
+                results = [
+                    {
                         "url": result.get("url", ""),
                         "title": result.get("title", ""),
                         "content": result.get("raw_content", "")[:20000],
-                    })
+                    }
+                    for result in response.get("results", [])
+                ]
                 
                 return {
                     "success": True,
@@ -247,10 +299,6 @@ def get_tavily_tools() -> list:
         
         return tools
         
-    except ImportError as e:
-        logger.warning(f"[TAVILY] Required packages not installed: {e}")
-        logger.warning("[TAVILY] Run: pip install tavily-python")
-        return []
     except Exception as e:
         logger.error(f"[TAVILY] Error initializing tools: {e}")
         return []
@@ -7,6 +7,7 @@ This will help diagnose why historical data is not being retrieved
 import os
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging to see all details
 logging.basicConfig(
@@ -33,11 +34,8 @@ def test_domain_history():
         return
     
     # Find domain_history tool
-    domain_history = None
-    for tool in tools:
-        if hasattr(tool, '__name__') and tool.__name__ == 'semrush_domain_history':
-            domain_history = tool
-            break
+    tools_by_name = {tool.__name__: tool for tool in tools if hasattr(tool, '__name__')}
+    domain_history = tools_by_name.get('semrush_domain_history')
     
     if not domain_history:
         print("❌ semrush_domain_history tool not found")
@@ -46,17 +44,23 @@ def test_domain_history():
     print("✅ Found semrush_domain_history tool")
     print()
     
-    # Test with writesonic.com
+    # Test with writesonic.com and seopage.ai
     test_domain = "writesonic.com"
-    print(f"📊 Testing with domain: {test_domain}")
+    test_domain2 = "seopage.ai"
+    print(f"📊 Testing with domains: {test_domain}, {test_domain2}")
     print(f"📅 Requesting 12 months of data")
     print(f"🌍 Database: us")
     print()
     print("-" * 80)
     print()
     
-    # Call the API
-    result = domain_history(test_domain, database='us', months=12)
+    # Call the API for both domains concurrently; the summaries below are
+    # still printed one domain at a time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result, result2 = executor.map(
+            lambda domain: domain_history(domain, database='us', months=12),
+            (test_domain, test_domain2),
+        )
     
     print()
     print("-" * 80)
@@ -103,15 +107,7 @@ def test_domain_history():
     print("=" * 80)
     print()
     
-    # Test with seopage.ai
-    test_domain2 = "seopage.ai"
-    print(f"📊 Testing with domain: {test_domain2}")
-    print()
-    print("-" * 80)
-    print()
-    
-    result2 = domain_history(test_domain2, database='us', months=12)
-    
+    print(f"📊 Domain: {test_domain2}")
     print()
     print("-" * 80)
     print()
@@ -108,6 +108,11 @@ export const ToolCallBox = React.memo<ToolCallBoxProps>(
         case "perplexity_search":
         case "perplexity_chat":
           return toolArgs.query || toolArgs.q || toolArgs.message || toolArgs.messages?.[0]?.content || null;
+        case "perplexity_batch_search":
+        case "serper_batch_search": {
+          const queries = toolArgs.queries as string[] | undefined;
+          return Array.isArray(queries) ? queries.join(", ") : null;
+        }
         case "write_todos": {
           const todos = toolArgs.todos as Array<{ status?: string }> | undefined;
           if (todos && Array.isArray(todos)) {